@@ -0,0 +1,45 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Cache that keeps up to the given number of most recently used items, and counts hits and misses so its size can
+    be tuned.
+    """
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._items = OrderedDict()
+
+        #: Number of lookups that found / didn't find an item
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        """ Return the item for the key and mark it as most recently used, or the default if it is not cached """
+        try:
+            value = self._items[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """ Cache the item for the key, dropping the least recently used item when full """
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+        self.hits = 0
+        self.misses = 0
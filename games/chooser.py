@@ -50,10 +50,7 @@ class Choose(Scene):
 
         self.screen.controller = game
         self.screen.reset()
-
-        while not game.done:
-            self.screen.render()
-            game.play()
+        self.screen.play(game)
 
         if len(self.games) == 1:
             self.controller.done = True
@@ -0,0 +1,74 @@
+class SpatialHash:
+    """
+    Uniform grid that buckets items by the coords they cover, so items near some coords can be found without
+    checking every item.
+    """
+    def __init__(self, cell_size=4):
+        self.cell_size = cell_size
+        self._buckets = {}
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def add(self, item, coords):
+        """ Add item to the buckets covered by the given (x, y) coords """
+        size = self.cell_size
+        for x, y in coords:
+            key = (x // size, y // size)
+            try:
+                self._buckets[key].append(item)
+            except KeyError:
+                self._buckets[key] = [item]
+
+    def query(self, coords):
+        """ Return the set of items in the buckets covered by the given (x, y) coords """
+        size = self.cell_size
+        items = set()
+        for key in {(x // size, y // size) for x, y in coords}:
+            bucket = self._buckets.get(key)
+            if bucket:
+                items.update(bucket)
+        return items
+
+
+def translate(offsets, x, y):
+    """ Return the set of the given (x, y) offsets moved by the given x and y """
+    return {(offset_x + x, offset_y + y) for offset_x, offset_y in offsets}
+
+
+class OccupancyGrid:
+    """
+    Cells occupied by something, stored as a bitmask of the occupied x of each row, so checking if two grids overlap
+    takes a shift and AND per row instead of building and intersecting sets of coords.
+    """
+    def __init__(self, rows=None, x=0, y=0):
+        #: Bitmask of each row by y relative to the grid position, where bit i is set when x + i is occupied
+        self.rows = {} if rows is None else rows
+
+        #: Position of the grid
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def from_coords(cls, coords):
+        """ Create a grid with the given (x, y) coords occupied, which must be ints """
+        coords = list(coords)
+        if not coords:
+            return cls()
+
+        min_x = min(x for x, _ in coords)
+        rows = {}
+        for x, y in coords:
+            rows[y] = rows.get(y, 0) | 1 << (x - min_x)
+        return cls(rows, x=min_x)
+
+    def overlaps(self, other, x_delta=0, y_delta=0):
+        """ Indicates if any cells of the other grid moved by the given deltas are occupied, checked row by row """
+        rows = self.rows
+        x_offset = other.x + x_delta - self.x
+        y_offset = other.y + y_delta - self.y
+        for y, mask in other.rows.items():
+            row = rows.get(y + y_offset)
+            if row and (row & mask << x_offset if x_offset >= 0 else row << -x_offset & mask):
+                return True
+        return False
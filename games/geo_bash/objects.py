@@ -37,12 +37,12 @@ class Player(AbstractPlayer):
 
             if self.char == 'O':
                 for x_delta in range(-1, 2):
-                    projectile = Projectile(self.x + x_delta, self.y-1, shape=self.char, parent=self,
-                                            color=color)
+                    projectile = Projectile.acquire(self.x + x_delta, self.y-1, shape=self.char, parent=self,
+                                                    color=color)
                     self.kids.add(projectile)
                     self.screen.add(projectile)
             else:
-                projectile = Projectile(self.x, self.y-1, shape=self.char, parent=self, color=color)
+                projectile = Projectile.acquire(self.x, self.y-1, shape=self.char, parent=self, color=color)
                 self.kids.add(projectile)
                 self.screen.add(projectile)
 
@@ -1,7 +1,7 @@
 from random import randint, random, choice
 
 from games.screen import Screen
-from games.objects import (Zombie, Explosion, Projectile, Monologue,
+from games.objects import (Zombie, Projectile, ParticleSystem, Monologue,
                            DyingZombie, AbstractPlayer, AbstractEnemies, CompassionateBoss)
 
 
@@ -60,17 +60,15 @@ class Player(AbstractPlayer):
             if (not self.using_machine_gun or self.using_machine_gun and self.ammos > 0
                     or self.using_flamethrower and self.gas > 0):
                 if self.using_flamethrower:
-                    for flame_size in range(10):
-                        explosion = Explosion(self.x, self.y, size=flame_size, parent=self)
-                        projectile = Projectile(self.x, self.y, shape=shape, parent=self,
-                                                x_delta=x_delta, y_delta=y_delta, color=color,
-                                                explode_after_renders=flame_size,
-                                                explosion=explosion)
-                        self.kids.add(projectile)
-                        self.screen.add(projectile)
+                    flames = ParticleSystem.acquire(self.x, self.y, parent=self)
+                    for flame_size in range(1, 10):
+                        flames.emit(self.x, self.y, x_delta=x_delta, y_delta=y_delta, fuse=flame_size,
+                                    size=flame_size)
+                    self.kids.add(flames)
+                    self.screen.add(flames)
                 else:
-                    projectile = Projectile(self.x, self.y, shape=shape, parent=self,
-                                            x_delta=x_delta, y_delta=y_delta, color=color)
+                    projectile = Projectile.acquire(self.x, self.y, shape=shape, parent=self,
+                                                    x_delta=x_delta, y_delta=y_delta, color=color)
                     self.kids.add(projectile)
                     self.screen.add(projectile)
 
@@ -174,14 +172,11 @@ class Player(AbstractPlayer):
         if self.grenades_enabled and self.grenades > 0 and self.alive:
             self.grenades -= 1
             x_delta, y_delta, shape = self.deltas[self.delta_index]
-            explosion = Explosion(self.x, self.y, size=min(self.screen.width, self.screen.height),
-                                  parent=self)
-            projectile = Projectile(self.x, self.y, shape=chr(0x274d), parent=self,
-                                    x_delta=x_delta, y_delta=y_delta, color=self.color,
-                                    explode_after_renders=10,
-                                    explosion=explosion, explosions=5)
-            self.kids.add(projectile)
-            self.screen.add(projectile)
+            grenade = ParticleSystem(self.x, self.y, shape=chr(0x274d), parent=self)
+            grenade.emit(self.x, self.y, x_delta=x_delta, y_delta=y_delta, fuse=10,
+                         size=min(self.screen.width, self.screen.height), bursts=5, color=self.color)
+            self.kids.add(grenade)
+            self.screen.add(grenade)
 
 
 class Enemies(AbstractEnemies):
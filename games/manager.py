@@ -1,16 +1,19 @@
-from games.screen import Screen
+from games.screen import Screen, AnsiScreen
 from games.objects import Border
 from games.chooser import Chooser
 
 
 class Manager:
-    def start(self, game_filter=None, fps=30, debug=False):
-        screen = Screen(border=Border(show_fps=debug), debug=debug, fps=fps)
+    #: Map of backend name to screen class used to render with
+    backends = {
+        'curses': Screen,
+        'ansi': AnsiScreen
+    }
+
+    def start(self, game_filter=None, fps=30, debug=False, compact=False, backend='curses'):
+        screen = self.backends[backend](border=Border(show_fps=debug), debug=debug, fps=fps, compact=compact)
 
         with screen:
             game = Chooser(screen, game_filter=game_filter)
             screen.controller = game
-
-            while not game.done:
-                screen.render()
-                game.play()
+            screen.play(game)
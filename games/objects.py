@@ -1,23 +1,142 @@
-from math import pi, sin, cos
-from random import randint, random, choice
-
+from array import array
+from bisect import bisect_left
+from math import floor, gcd, pi, sin, cos
+from random import randint, random, choice, sample
+
+from games.cache import LRUCache
+from games.coords import OccupancyGrid, SpatialHash, translate
+from games.pool import pool
 from games.screen import Screen
 from games.listeners import KeyListener
 
+try:
+    import numpy
+except ImportError:  # Optional to transform points of Object3D in one go
+    numpy = None
+
+
+class KidSet(set):
+    """
+    Set of kids for a screen object (the owner) that keeps track of which objects hold each kid, and invalidates the
+    owner's cached `all_kids` / `all_coords` when kids are added or removed.
+    """
+    __slots__ = ('owner',)
+
+    def __init__(self, owner, kids=()):
+        super().__init__()
+        self.owner = owner
+        self.update(kids)
+
+    def add(self, kid):
+        if kid not in self:
+            super().add(kid)
+            if self.owner:
+                if kid._holders is None:
+                    kid._holders = set()
+                kid._holders.add(self.owner)
+                self.owner._invalidate()
+
+    def discard(self, kid):
+        if kid in self:
+            super().discard(kid)
+            if self.owner:
+                kid._holders.discard(self.owner)
+                self.owner._invalidate()
+
+    def remove(self, kid):
+        if kid not in self:
+            raise KeyError(kid)
+        self.discard(kid)
+
+    def pop(self):
+        kid = super().pop()
+        if self.owner:
+            kid._holders.discard(self.owner)
+            self.owner._invalidate()
+        return kid
+
+    def clear(self):
+        while self:
+            self.pop()
+
+    def detach(self):
+        """ Stop tracking kids for the owner, e.g. when the owner is given a new set of kids """
+        if self.owner:
+            for kid in self:
+                kid._holders.discard(self.owner)
+            self.owner._invalidate()
+            self.owner = None
+
+    def update(self, *others):
+        for other in others:
+            for kid in other:
+                self.add(kid)
+
+    def difference_update(self, *others):
+        for other in others:
+            for kid in list(other):
+                self.discard(kid)
+
+    def intersection_update(self, *others):
+        self.difference_update(set(self).difference(set(self).intersection(*others)))
+
+    def symmetric_difference_update(self, other):
+        other = set(other)
+        self.difference_update(other & self)
+        self.update(other - self)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
 
 class ScreenObject:
-    """ Base class for all objects on screen """
+    """
+    Base class for all objects on screen
+
+    Core classes use `__slots__` to save memory for the many objects created. Subclasses without `__slots__` get a
+    `__dict__` as usual, so they can add any attributes.
+    """
+    __slots__ = ('_holders', '_all_kids', '_all_coords', '_occupancy', '_pooled', 'x', 'y', 'x_delta', 'y_delta',
+                 'color', '_size', '_coords', 'parent', '_kids', 'screen', 'visible', 'renders', 'remove_after_renders',
+                 'on_remove', '_random_movement', 'player')
+
+    #: Offsets of the cells of shapes by (class, key), and their (min x, min y, max x, max y). See `template`.
+    _templates = {}
+    _template_bounds = {}
+
     def __init__(self, x: int, y: int, x_delta=0, y_delta=0, color=None, size=1, parent=None,
                  remove_after_renders=None, on_remove=None, random_movement=False, player=None):
+        #: Objects that have this object as a kid, or None when there are none yet
+        self._holders = None
+
+        #: Set when the object was acquired from the pool, so it is released back to it once removed from the screen
+        self._pooled = False
+
+        #: Cached `all_kids` / `all_coords` / `occupancy`, or None when they need to be rebuilt
+        self._all_kids = None
+        self._all_coords = None
+        self._occupancy = None
+
         self.x = x
         self.y = y
         self.x_delta = x_delta
         self.y_delta = y_delta
         self.color = color or getattr(self, 'color', None)
         self._size = size
-        self.coords = set()
         self.parent = parent
-        self.kids = set()
         self.screen = None
         self.visible = True
         self.renders = 0
@@ -26,6 +145,10 @@ class ScreenObject:
         self._random_movement = random_movement or getattr(self, 'random_movement', False)
         self.player = player
 
+        #: Kids and coords are created when first used, as many objects never have kids
+        self._kids = None
+        self._coords = None
+
     def reset(self):
         """ Reset object to original state """
         self.renders = 0
@@ -35,6 +158,15 @@ class ScreenObject:
                     self.screen.remove(kid)
         self.kids = set()
 
+    @classmethod
+    def acquire(cls, *args, **kwargs):
+        """
+        Get an instance from the object pool initialized with the given args, which is released back to the pool
+        after it is removed from the screen. Use for short-lived objects that are created often, and don't keep
+        references to them once they are removed.
+        """
+        return pool.acquire(cls, *args, **kwargs)
+
     def copy(self):
         obj = self.__class__(self.x, self.y, x_delta=self.x_delta, y_delta=self.y_delta,
                              color=self.color, size=self.size, parent=self.parent)
@@ -54,27 +186,82 @@ class ScreenObject:
         self.on_size_change(value)
 
     @property
-    def all_kids(self):
-        kids = self.kids.copy()
-        all_kids = set()
+    def kids(self):
+        if self._kids is None:
+            self._kids = KidSet(self)
+        return self._kids
 
-        while kids:
-            kid = kids.pop()
-            all_kids.add(kid)
+    @kids.setter
+    def kids(self, kids):
+        if getattr(self, '_kids', None) is not None:
+            self._kids.detach()
+        self._kids = KidSet(self, kids)
 
-            if kid.kids:
-                kids.update(kid.kids)
+    @property
+    def coords(self):
+        if self._coords is None:
+            self._coords = set()
+        return self._coords
+
+    @coords.setter
+    def coords(self, coords):
+        """
+        Set coords of the object. Coords should be reassigned rather than changed in place outside of `render` so
+        cached `all_coords` of this object and its holders, and its `occupancy` are invalidated.
+        """
+        self._coords = coords
+        self._occupancy = None
+        self._invalidate(coords_only=True)
+
+    def _invalidate(self, coords_only=False):
+        """ Invalidate cached `all_coords` (and `all_kids` unless `coords_only`) of this object and its holders """
+        # A valid `all_coords` is built from the ones of the kids, so the holders of an invalid one are invalid too.
+        if coords_only and self._all_coords is None:
+            return
+
+        self._all_coords = None
+        if not coords_only:
+            self._all_kids = None
+
+        if self._holders:
+            for holder in self._holders:
+                holder._invalidate(coords_only)
+
+    @property
+    def all_kids(self):
+        """ All kids of this object and their kids. This is a cached set, so it should not be changed. """
+        if self._all_kids is None:
+            all_kids = set(self._kids or ())
+            if self._kids:
+                for kid in self._kids:
+                    if kid._kids:
+                        all_kids |= kid.all_kids
+            self._all_kids = all_kids
 
-        return all_kids
+        return self._all_kids
 
     @property
     def all_coords(self):
-        """ All coords of this object and its kids """
-        coords = self.coords.copy()
-        for kid in self.all_kids:
-            coords.update(kid.coords)
+        """ All coords of this object and its kids. This is a cached set, so it should not be changed. """
+        if self._all_coords is None:
+            if self._kids:
+                coords = set(self.coords)
+                for kid in self._kids:
+                    coords |= kid.all_coords
+                self._all_coords = coords
+            else:
+                self._all_coords = self.coords
 
-        return coords
+        return self._all_coords
+
+    @property
+    def occupancy(self):
+        """
+        `OccupancyGrid` of the coords of this object, which must be ints. This is cached, so it should not be changed.
+        """
+        if self._occupancy is None:
+            self._occupancy = OccupancyGrid.from_coords(self.coords)
+        return self._occupancy
 
     @property
     def is_out(self):
@@ -97,13 +284,69 @@ class ScreenObject:
         """ Indicates if object can move by given or self delta """
         return y_delta or self.y_delta or True
 
-    def shifted_coords(self, x_delta=0, y_delta=0):
+    def relayout(self, old_width, old_height, width, height):
+        """
+        Reposition the object after the screen is resized from old width/height. Objects near an edge keep their
+        distance to it while those in the middle keep their relative position.
+        """
+        self.x = self._relayout_position(self.x, old_width, width)
+        self.y = self._relayout_position(self.y, old_height, height)
+
+    @staticmethod
+    def _relayout_position(position, old_size, size):
+        if position < old_size / 3:
+            return position
+        if position > old_size * 2 / 3:
+            return position + size - old_size
+        return position * size / old_size
+
+    def shift(self, x_delta=0, y_delta=0):
+        """ Return the (x, y) number of cells that the coords of the object move by for the given deltas """
         x_adjustment = (self.x - int(self.x)) if x_delta else 0
         y_adjustment = (self.y - int(self.y)) * 1.1 if y_delta else 0  # Times 1.1 to avoid stuck in rock
-        new_coords = set()
-        for x, y in self.coords:
-            new_coords.add((int(x + x_delta + x_adjustment), int(y + y_delta + y_adjustment)))
-        return new_coords
+        return floor(x_delta + x_adjustment), floor(y_delta + y_adjustment)
+
+    def shifted_coords(self, x_delta=0, y_delta=0):
+        return translate(self.coords, *self.shift(x_delta=x_delta, y_delta=y_delta))
+
+    def overlaps(self, screen_object, x_delta=0, y_delta=0):
+        """ Indicates if the given object would overlap this one if it moved by the given deltas """
+        return not self.coords.isdisjoint(translate(screen_object.coords, x_delta, y_delta))
+
+    def template(self, *key):
+        """
+        Return the offsets of the cells of the shape for the given key (e.g. size), made by `make_template` once per
+        class and key, so coords are built by translating them instead of from scratch each render.
+        """
+        key = (type(self),) + key
+        try:
+            return self._templates[key]
+        except KeyError:
+            template = self._templates[key] = tuple(self.make_template(*key[1:]))
+            xs = [x for x, _ in template] or [0]
+            ys = [y for _, y in template] or [0]
+            self._template_bounds[key] = (min(xs), min(ys), max(xs), max(ys))
+            return template
+
+    def make_template(self, *key):
+        """ Return the offsets of the cells of the shape for the key given to `template` """
+        raise NotImplementedError
+
+    def place(self, *key):
+        """
+        Return the coords of the cells of `template(*key)` around the object, where each cell is at
+        `(int(self.x + dx), int(self.y + dy))`. That is the template moved by `int(self.x), int(self.y)` unless a
+        fractional position has cells on the other side of 0, where `int` rounds the other way.
+        """
+        offsets = self.template(*key)
+        x, y = self.x, self.y
+        int_x, int_y = int(x), int(y)
+        min_x, min_y, max_x, max_y = self._template_bounds[(type(self),) + key]
+        if ((x == int_x or (x + min_x >= 0 if x > 0 else x + max_x <= 0))
+                and (y == int_y or (y + min_y >= 0 if y > 0 else y + max_y <= 0))):
+            return translate(offsets, int_x, int_y)
+
+        return {(int(x + dx), int(y + dy)) for dx, dy in offsets}
 
     def sync(self, screen_object, location_only=False):
         self.x = screen_object.x
@@ -151,8 +394,8 @@ class ScreenObject:
             screen_object.parent = self
 
     def remove_kid(self, screen_object):
-        if screen_object in self.kids:
-            self.kids.remove(screen_object)
+        if self._kids and screen_object in self._kids:
+            self._kids.remove(screen_object)
 
     def replace_kid(self, old_object, new_object):
         self.remove_kid(old_object)
@@ -167,6 +410,24 @@ class ScreenObject:
 
 
 class Object3D(ScreenObject):
+    #: Rotation matrices by (rotate axes, theta), shared by objects that rotate the same way
+    _rotations = {}
+
+    #: Cells of the edges connecting points by the points relative to the first one. See `edges`.
+    _edges = {}
+
+    #: Max number of rotation matrices / edges to cache before starting over
+    MAX_ROTATIONS = 1024
+
+    #: Min number of points to transform with NumPy, as it is slower than plain Python for fewer points
+    NUMPY_MIN_POINTS = 32
+
+    #: Number of phases (angles) per turn that rotating shapes are drawn at
+    PHASES = 360
+
+    #: Offsets of points and edges for each phase by shape, shared by all instances. See `frame`.
+    frames = LRUCache(max_size=4096)
+
     def __init__(self, *args, points=None, connect_points=False, rotate_axes=None, random_start=False,
                  magnify_by_size=False, **kwargs):
         super().__init__(*args, **kwargs)
@@ -178,7 +439,7 @@ class Object3D(ScreenObject):
         self.connect_points = connect_points
 
         #: Axes (x, y, z) to rotate
-        self._rotate_axes = rotate_axes or getattr(self, 'rotate_axes', (1, 1, 2, 1))
+        self._rotate_axes = tuple(rotate_axes or getattr(self, 'rotate_axes', (1, 1, 2, 1)))
 
         #: Factor to multiply theta to adjust rotation
         if len(self._rotate_axes) > 3:
@@ -191,96 +452,190 @@ class Object3D(ScreenObject):
         #: Factor to magnify the points
         self.magnify_by_size = magnify_by_size
 
+        #: Points the (x, y, z) coordinates / array below were made from, which are rebuilt when points change
+        self._xyz_points = None
+        self._xyz = None
+        self._xyz_array = None
+
     @staticmethod
     def dot(m1, m2):
         """ Return the product of the given two matrices """
         return [[sum(a * b for a, b in zip(m1_row, m2_col)) for m2_col in zip(*m2)] for m1_row in m1]
 
+    @classmethod
+    def rotation(cls, rotate_axes, theta):
+        """
+        Return the matrix that rotates points around the x, y, and then z axis by theta (radian) for each axis set in
+        rotate_axes, where the value of the axis scales the points along it.
+        """
+        key = (rotate_axes, theta)
+        try:
+            return cls._rotations[key]
+        except KeyError:
+            pass
+
+        cos_theta = cos(theta)
+        sin_theta = sin(theta)
+        rotations = []
+
+        if rotate_axes[0]:  # x
+            rotations.append([
+                [rotate_axes[0], 0, 0],
+                [0, cos_theta, -sin_theta],
+                [0, sin_theta, cos_theta],
+            ])
+
+        if rotate_axes[1]:  # y
+            rotations.append([
+                [cos_theta, 0, sin_theta],
+                [0, rotate_axes[1], 0],
+                [-sin_theta, 0, cos_theta],
+            ])
+
+        if rotate_axes[2]:  # z
+            rotations.append([
+                [cos_theta, -sin_theta, 0],
+                [sin_theta, cos_theta, 0],
+                [0, 0, rotate_axes[2]],
+            ])
+
+        matrix = rotations[0] if rotations else [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+        for rotation in rotations[1:]:
+            matrix = cls.dot(rotation, matrix)
+
+        if len(cls._rotations) >= cls.MAX_ROTATIONS:
+            cls._rotations.clear()
+        cls._rotations[key] = matrix
+
+        return matrix
+
     def rotate_point(self, point, theta):
         """ Rotate the given point using self._rotate_axes and theta (radian) """
-        new_point = [[point[0]], [point[1]], [point[2]]]
-
-        if self._rotate_axes[0]:  # x
-            x_rotation = [
-                [self._rotate_axes[0], 0, 0],
-                [0, cos(theta), -sin(theta)],
-                [0, sin(theta), cos(theta)],
-            ]
-            new_point = self.dot(x_rotation, new_point)
-
-        if self._rotate_axes[1]:  # y
-            y_rotation = [
-                [cos(theta), 0, sin(theta)],
-                [0, self._rotate_axes[1], 0],
-                [-sin(theta), 0, cos(theta)],
-            ]
-            new_point = self.dot(y_rotation, new_point)
-
-        if self._rotate_axes[2]:  # z
-            z_rotation = [
-                [cos(theta), -sin(theta), 0],
-                [sin(theta), cos(theta), 0],
-                [0, 0, self._rotate_axes[2]],
-            ]
-            new_point = self.dot(z_rotation, new_point)
-
-        return new_point[0][0], new_point[1][0], new_point[2][0]
+        matrix = self.rotation(self._rotate_axes, theta)
+        return tuple(row[0] * point[0] + row[1] * point[1] + row[2] * point[2] for row in matrix)
+
+    def _load_points(self):
+        """ Rebuild the (x, y, z) coordinates of the points when they changed """
+        if self._xyz_points is not self._points:
+            self._xyz_points = self._points
+            self._xyz = tuple(tuple(point[:3]) for point in self._points)
+            self._xyz_array = (numpy.array(self._xyz, dtype=float).reshape(-1, 3)
+                               if numpy and len(self._xyz) >= self.NUMPY_MIN_POINTS else None)
+
+    def project(self, theta):
+        """ Rotate all points by theta (radian) at once and return their (x, y) offsets from the object position """
+        self._load_points()
+        (xx, xy, xz), (yx, yy, yz), _ = self.rotation(self._rotate_axes, theta)
+        scale = self.size if self.magnify_by_size else 1
+
+        if self._xyz_array is not None:
+            offsets = self._xyz_array.dot(numpy.array(((xx, yx), (xy, yy), (xz, yz)), dtype=float))
+            if self.magnify_by_size:
+                offsets *= scale
+            return list(zip(*numpy.rint(offsets).astype(int).T.tolist()))
+
+        return [(round((xx * x + xy * y + xz * z) * scale), round((yx * x + yy * y + yz * z) * scale))
+                for x, y, z in self._xyz]
+
+    def frame(self, theta):
+        """
+        Return the (x, y) offsets of the points and of the cells of the edges connecting them from the object position
+        for theta (radian) rounded to one of `PHASES`. Frames are cached by shape and phase, so instances of the same
+        shape share them as they translate the offsets.
+        """
+        self._load_points()
+        phase = round(theta / (2 * pi) * self.PHASES) % self.PHASES
+        scale = self.size if self.magnify_by_size else 1
+        key = (self._xyz, self._rotate_axes[:3], scale, self.connect_points, phase)
+
+        frame = self.frames.get(key)
+        if frame is None:
+            points = self.project(phase * 2 * pi / self.PHASES)
+            edges = ()
+            if self.connect_points and points:
+                first_x, first_y = points[0]
+                edges = tuple((x + first_x, y + first_y) for x, y in self.edges(points))
+            frame = (points, edges)
+            self.frames.put(key, frame)
+
+        return frame
 
     def render(self, screen: Screen):
         super().render(screen)
         self.coords = set()
 
-        points = []
-        for point in self._points:
+        theta = (screen.renders / 10 * self.theta_factor) % (2 * pi)
+        points, edges = self.frame(theta)
+        origin_x = int(self.x)
+        origin_y = int(self.y)
+        draw = screen.draw
+        block = chr(0x2588)
+
+        for point, (x, y) in zip(self._points, points):
             color = (point[3] if len(point) > 3 else None) or self.color
-            theta = (screen.renders / 10 * self.theta_factor) % (2 * pi)
-            new_point = self.rotate_point(point, theta)
-            x, y, _ = new_point
+            x += origin_x
+            y += origin_y
+            draw(x, y, block, color)
+            self.coords.add((x, y))
 
-            if self.magnify_by_size:
-                x *= self.size
-                y *= self.size
-
-            abs_x = int(self.x + x)
-            abs_y = int(self.y + y)
-
-            screen.draw(abs_x, abs_y, chr(0x2588), color)
-            points.append((abs_x, abs_y))
-            self.coords.add((abs_x, abs_y))
-
-        if self.connect_points:
-            last_point = None
-            connecting_points = set()
-            for point in points:
-                if last_point:
-                    x_offset = last_point[0]
-                    y_offset = last_point[1]
-                    x_delta = (point[0] - last_point[0])
-                    y_delta = (point[1] - last_point[1])
-                    x_sign = 1 if point[0] >= last_point[0] else -1
-                    y_sign = 1 if point[1] >= last_point[1] else -1
-
-                    if x_delta:
-                        slope = (point[1] - last_point[1]) / x_delta
-
-                        if abs(x_delta) > abs(y_delta):
-                            for x in range(last_point[0], point[0], x_sign):
-                                y = slope * (x - x_offset) + y_offset
-                                connecting_points.add((int(x), int(y)))
-                        else:
-                            for y in range(last_point[1], point[1], y_sign):
-                                x = (y - y_offset) / slope + x_offset
-                                connecting_points.add((int(x), int(y)))
+        if edges:
+            cells = [(x + origin_x, y + origin_y) for x, y in edges]
+            for x, y in cells:
+                draw(x, y, block, self.color)
+            self.coords.update(cells)
+
+        screen.debug(shape_misses=self.frames.misses)
 
-                    else:
-                        for y in range(last_point[1], point[1], y_sign):
-                            connecting_points.add((x_offset, int(y)))
+    @staticmethod
+    def line(x0, y0, x1, y1):
+        """
+        Return the cells of the line between (x0, y0) and (x1, y1) using Bresenham's algorithm. Lines are always
+        drawn from the lesser point, so the same cells are returned for either direction.
+        """
+        if (x1, y1) < (x0, y0):
+            x0, y0, x1, y1 = x1, y1, x0, y0
+
+        cells = [(x0, y0)]
+        x_distance = x1 - x0
+        y_distance = -abs(y1 - y0)
+        y_step = 1 if y0 < y1 else -1
+        error = x_distance + y_distance
+
+        while x0 != x1 or y0 != y1:
+            double_error = 2 * error
+            if double_error >= y_distance:
+                error += y_distance
+                x0 += 1
+            if double_error <= x_distance:
+                error += x_distance
+                y0 += y_step
+            cells.append((x0, y0))
+
+        return cells
+
+    @classmethod
+    def edges(cls, points):
+        """
+        Return the cells of the lines connecting the given (x, y) points in order, excluding the points, relative to
+        the first point. Cached by the points relative to the first, so a rotating shape only rasterizes each pose once.
+        """
+        origin_x, origin_y = points[0]
+        key = tuple((x - origin_x, y - origin_y) for x, y in points)
+        try:
+            return cls._edges[key]
+        except KeyError:
+            pass
 
-                last_point = point
+        cells = set()
+        for (x0, y0), (x1, y1) in zip(key, key[1:]):
+            cells.update(cls.line(x0, y0, x1, y1))
+        cells.difference_update(key)
 
-            for point in (connecting_points - set(points)):
-                screen.draw(point[0], point[1], chr(0x2588), self.color)
-                self.coords.add((int(point[0]), int(point[1])))
+        if len(cls._edges) >= cls.MAX_ROTATIONS:
+            cls._edges.clear()
+        cls._edges[key] = edges = tuple(cells)
+
+        return edges
 
 
 class Line3D(Object3D):
@@ -403,14 +758,14 @@ class AbstractPlayer(ScreenObject, KeyListener):
         return (self.screen
                 and (self.x + x_delta > self.size and self.x + x_delta < self.screen.width - self.size)
                 and (not self.obstacles
-                     or not (self.obstacles.coords & self.shifted_coords(x_delta=x_delta))))
+                     or not self.obstacles.overlaps(self, *self.shift(x_delta=x_delta))))
 
     def can_move_y(self, y_delta=0):
         y_delta = y_delta or self.y_delta or 0
         return (self.screen
                 and (self.y + y_delta > self.size / 2 and self.y + y_delta < self.screen.height-self.size/2)
                 and (not self.obstacles
-                     or not (self.obstacles.coords & self.shifted_coords(y_delta=y_delta))))
+                     or not self.obstacles.overlaps(self, *self.shift(y_delta=y_delta))))
 
     def render(self, screen: Screen):
         super().render(screen)
@@ -551,6 +906,14 @@ class AbstractEnemies(ScreenObject):
                 self.add_kid(self.boss)
                 screen.add(self.boss)
 
+        # Bucket the player's projectiles by their coords once, so each enemy only checks the ones near it.
+        # Candidates are checked in the order of all_kids, same as checking all of them.
+        projectiles = list(self.player.all_kids)
+        projectile_hash = SpatialHash()
+        for index, projectile in enumerate(projectiles):
+            projectile_hash.add(index, projectile.coords)
+        removed_projectiles = set()
+
         for enemy in list(self.kids):
             # Make them go fast when player is destroyed
             if not self.player.active:
@@ -565,8 +928,9 @@ class AbstractEnemies(ScreenObject):
 
             # Otherwise, check if player's projectiles hit the enemies
             else:
-                for projectile in list(self.player.all_kids):
-                    if projectile.coords & enemy.coords:
+                for index in sorted(projectile_hash.query(enemy.coords)):
+                    projectile = projectiles[index]
+                    if projectile not in removed_projectiles and projectile.coords & enemy.coords:
                         if enemy == self.boss and self.boss.hp > 0:
                             self.boss.hp -= 1
                             self.boss.is_hit = True
@@ -574,8 +938,14 @@ class AbstractEnemies(ScreenObject):
 
                         enemy.remove()
 
-                        self.player.remove_kid(projectile)
-                        projectile.remove()
+                        # Only the particles that hit are removed from a particle system
+                        if isinstance(projectile, ParticleSystem):
+                            projectile.hit(enemy.coords)
+                        else:
+                            self.player.remove_kid(projectile)
+                            projectile.remove()
+                            removed_projectiles.add(projectile)
+                            removed_projectiles.update(projectile.all_kids)
 
                         self.on_death(enemy)
 
@@ -594,6 +964,12 @@ class AbstractEnemies(ScreenObject):
 
 
 class Bitmap(ScreenObject):
+    __slots__ = ('char', '_bitmaps', '_frames_per_bitmap', '_remove_after_animation', '_bitmap_index_offset', 'flip',
+                 '_flip_map', 'centered', '_bitmap')
+
+    #: Compiled sprite frames by (class, bitmap, flip, char), shared by all instances. See `sprite`.
+    _sprites = {}
+
     def __init__(self, *args, char=None, random_start=False, remove_after_animation=False,
                  flip=False, centered=True, **kwargs):
         super().__init__(*args, **kwargs)
@@ -612,13 +988,49 @@ class Bitmap(ScreenObject):
 ▓▓▓▓▓
 ▓▓▓▓▓
 """)  # noqa
-        self.size = len(self._bitmap.strip('\n').split('\n'))
+        self.size = self.sprite(self._bitmap)[1]
+
+    def sprite(self, bitmap):
+        """
+        Return the bitmap compiled into a sprite frame of (x_size, y_size, offsets), where offsets is a tuple of
+        (dx, dy, char) for each non-blank char with flip and char override applied.
+        """
+        key = (self.__class__, bitmap, self.flip, self.char)
+        try:
+            return self._sprites[key]
+        except KeyError:
+            pass
+
+        rows = bitmap.strip('\n').split('\n')
+        x_size = max(len(row) for row in rows)
+        offsets = []
+        for dy, row in enumerate(rows):
+            for dx in range(x_size):
+                x_offset = x_size - dx - 1 if self.flip else dx
+                if x_offset < len(row) and row[x_offset] != ' ':
+                    char = self.char or row[x_offset]
+                    if self.flip and char in self._flip_map:
+                        char = self._flip_map[char]
+                    offsets.append((dx, dy, char))
+
+        sprite = self._sprites[key] = (x_size, len(rows), tuple(offsets))
+        return sprite
 
     def draw(self, x, y, char, screen: Screen):
         color = self.color[self.renders % len(self.color)] if type(self.color) in (tuple, list) else self.color
         screen.draw(x, y, char, color=color)
         self.coords.add((x, y))
 
+    def blit(self, offsets, start_x, start_y, screen: Screen):
+        """ Draw the (dx, dy, char) offsets of a sprite frame from the given start position """
+        color = self.color[self.renders % len(self.color)] if type(self.color) in (tuple, list) else self.color
+        coords = self.coords
+        for dx, dy, char in offsets:
+            x = start_x + dx
+            y = start_y + dy
+            screen.draw(x, y, char, color)
+            coords.add((x, y))
+
     def render(self, screen: Screen):
         super().render(screen)
 
@@ -627,9 +1039,8 @@ class Bitmap(ScreenObject):
             bitmap = self._bitmaps[index]
         else:
             bitmap = self._bitmap
-        bitmap = bitmap.strip('\n').split('\n')
+        x_size, y_size, offsets = self.sprite(bitmap)
 
-        x_size = max(len(b) for b in bitmap)
         if self.centered:
             start_x = int(self.x - x_size / 2 + 0.5)
             start_y = int(self.y - self.size / 2 + 0.5)
@@ -638,18 +1049,9 @@ class Bitmap(ScreenObject):
             start_y = int(self.y)
         self.coords = set()
 
-        for y in range(start_y, start_y + self.size):
-            y_offset = y - start_y
-            # x_size = len(bitmap[y_offset])
-            for x in range(start_x, start_x + x_size):
-                x_offset = x - start_x
-                if self.flip:
-                    x_offset = x_size - x_offset - 1
-                if x_offset < len(bitmap[y_offset]) and bitmap[y_offset][x_offset] != ' ':
-                    char = self.char or bitmap[y_offset][x_offset]
-                    if self.flip and char in self._flip_map:
-                        char = self._flip_map[char]
-                    self.draw(x, y, char, screen)
+        if y_size > self.size:
+            offsets = tuple(offset for offset in offsets if offset[1] < self.size)
+        self.blit(offsets, start_x, start_y, screen)
 
         if self._remove_after_animation and self.renders > self._frames_per_bitmap * (len(self._bitmaps) - 1):
             screen.remove(self)
@@ -657,8 +1059,46 @@ class Bitmap(ScreenObject):
                 self.parent.remove_kid(self)
 
 
+class Raster:
+    """ Offscreen layer that screen objects can render onto like a screen """
+    def __init__(self):
+        #: Map of (x, y) to (char, color) drawn
+        self.cells = {}
+
+    def draw(self, x: int, y: int, char: str, color=None):
+        self.cells[int(x), int(y)] = (char, color)
+
+    def rows(self, origin_x=0, origin_y=0):
+        """ Return cells as a list of (y, xs, cells) for each row, where cells are (x, char, color) sorted by x """
+        rows = {}
+        for (x, y), (char, color) in self.cells.items():
+            rows.setdefault(y - origin_y, []).append((x - origin_x, char, color))
+
+        return [(y, [cell[0] for cell in cells], cells)
+                for y, cells in sorted((y, sorted(cells, key=lambda cell: cell[0])) for y, cells in rows.items())]
+
+
 class ObjectMap(Bitmap):
     """ Represents screen objects using characters on a bitmap """
+    #: Flyweight tile for each mapped object class, shared by all object maps and moved into place for each char
+    _tiles = {}
+
+    #: Number of tiles created, which stays at one per mapped object class as tiles are reused across frames
+    tiles_created = 0
+
+    #: Rasterize the mapped objects once per animation phase and copy the visible part of the raster onto the
+    #: screen, instead of rendering every mapped object each frame. For static maps that are scrolled by x/y.
+    prerender = False
+
+    #: Rasters by (class, sprite offsets, grid size, animation phase), shared by all instances of a class
+    _rasters = LRUCache(max_size=256)
+
+    #: Occupancy grids of the rasters by the same key as `_rasters`. See `raster_occupancy`.
+    _occupancies = LRUCache(max_size=256)
+
+    #: Origin of the objects rendered into rasters, far enough from 0 so they all render at positive coords
+    RASTER_ORIGIN = 1000
+
     def __init__(self, *args, grid_size=5, **kwargs):
         super().__init__(*args, centered=False, **kwargs)
 
@@ -670,6 +1110,26 @@ class ObjectMap(Bitmap):
 
         self._objects_mapped = 0
 
+        #: (offsets, renders, start_x, start_y) of the raster blitted last, or None when not prerendered
+        self._blitted = None
+
+        #: Number of renders after which mapped objects look the same again
+        self.animation_period = 1
+        for obj_cls in self._object_map.values():
+            period = self._animation_period(obj_cls)
+            self.animation_period = self.animation_period * period // gcd(self.animation_period, period)
+
+    @staticmethod
+    def _animation_period(obj_cls):
+        bitmaps = getattr(obj_cls, 'bitmaps', None)
+        period = getattr(obj_cls, 'frames_per_bitmap', 10) * len(bitmaps) if bitmaps else 1
+
+        color = getattr(obj_cls, 'color', None)
+        if type(color) in (tuple, list):
+            period = period * len(color) // gcd(period, len(color))
+
+        return period
+
     @property
     def is_out(self):
         return False  # We want to be rendered always
@@ -678,6 +1138,7 @@ class ObjectMap(Bitmap):
         # from time import time
         # start = time()
 
+        self._blitted = None
         super().render(screen)
 
         # if not getattr(screen, 'render_secs', None):
@@ -685,6 +1146,87 @@ class ObjectMap(Bitmap):
         # screen.render_secs[self.__class__.__name__] = round((time() - start) * screen.fps_limit * 60, 2)
         # screen.debug(render_secs=screen.render_secs)
 
+        screen.debug(tiles=ObjectMap.tiles_created)
+
+    def blit(self, offsets, start_x, start_y, screen: Screen):
+        if self.prerender:
+            renders = self.renders + start_x
+            self.blit_raster(self.raster(offsets, renders), start_x, start_y, screen)
+            self._blitted = (offsets, renders, start_x, start_y)
+        else:
+            for dx, dy, char in offsets:
+                self.draw(start_x + dx, start_y + dy, char, screen)
+
+    def raster(self, offsets, renders):
+        """
+        Return the rows of the raster with the objects mapped by the (dx, dy, char) offsets of a sprite frame,
+        rendered like `draw` would when the map is at 0, 0. See `Raster.rows` for format. Offsets must be a tuple, as
+        rasters are cached by them.
+        """
+        phase = renders % self.animation_period
+        key = (self.__class__, offsets, self.grid_size, phase)
+        rows = self._rasters.get(key)
+        if rows is not None:
+            return rows
+
+        raster = Raster()
+        for dx, dy, char in offsets:
+            if char in self._object_map:
+                tile = self.tile(self._object_map[char])
+                tile.x = dx * self.grid_size + self.RASTER_ORIGIN
+                tile.y = dy * self.grid_size + self.RASTER_ORIGIN + self.grid_size / 2
+                tile.renders = phase + dx * self.grid_size
+                tile.render(raster)
+
+        rows = raster.rows(self.RASTER_ORIGIN, self.RASTER_ORIGIN)
+        self._rasters.put(key, rows)
+        return rows
+
+    def raster_occupancy(self, offsets, renders):
+        """ Return the `OccupancyGrid` of the cells of the raster returned by `raster` for the same args """
+        key = (self.__class__, offsets, self.grid_size, renders % self.animation_period)
+        grid = self._occupancies.get(key)
+        if grid is None:
+            rows = self.raster(offsets, renders)
+            grid = OccupancyGrid.from_coords((x, y) for y, xs, _ in rows for x in xs)
+            self._occupancies.put(key, grid)
+        return grid
+
+    @property
+    def occupancy(self):
+        if self._occupancy is None and self._blitted:
+            offsets, renders, start_x, start_y = self._blitted
+            grid = self.raster_occupancy(offsets, renders)
+            self._occupancy = OccupancyGrid(grid.rows, x=grid.x + start_x, y=grid.y + start_y)
+        return super().occupancy
+
+    def overlaps(self, screen_object, x_delta=0, y_delta=0):
+        if self._blitted is None:
+            return super().overlaps(screen_object, x_delta=x_delta, y_delta=y_delta)
+
+        # Check the rows of the cached grids of the raster and object instead of intersecting their coords
+        return self.occupancy.overlaps(screen_object.occupancy, x_delta=x_delta, y_delta=y_delta)
+
+    def blit_raster(self, rows, start_x, start_y, screen: Screen):
+        """ Copy the part of the raster rows that is visible on screen from the given start position """
+        coords = self.coords
+        for y, xs, cells in rows:
+            y += start_y
+            if 0 <= y < screen.height:
+                for x, char, color in cells[bisect_left(xs, -start_x):bisect_left(xs, screen.width - start_x)]:
+                    x += start_x
+                    screen.draw(x, y, char, color)
+                    coords.add((x, y))
+
+    def tile(self, obj_cls):
+        """ Return the flyweight tile for the mapped object class """
+        try:
+            return self._tiles[obj_cls]
+        except KeyError:
+            ObjectMap.tiles_created += 1
+            tile = self._tiles[obj_cls] = obj_cls(0, 0)
+            return tile
+
     def draw(self, x, y, char, screen):
         x = (x - int(self.x)) * self.grid_size + int(self.x)
         y = (y - int(self.y)) * self.grid_size + int(self.y) + self.grid_size / 2
@@ -692,16 +1234,19 @@ class ObjectMap(Bitmap):
             if (x > screen.width + self.grid_size or y > screen.height + self.grid_size
                     or x < -self.grid_size or y < -self.grid_size):
                 return
-            obj_cls = self._object_map[char]
-            obj = obj_cls(x, y)
+            tile = self.tile(self._object_map[char])
             self._objects_mapped += 1
             # screen.debug(objects_mapped_per_frame=int(self._objects_mapped / screen.renders))
-            obj.renders = self.renders + x
-            obj.render(screen)
-            self.coords.update(obj.coords)
+            tile.x = x
+            tile.y = y
+            tile.renders = self.renders + x
+            tile.render(screen)
+            self.coords.update(tile.coords)
 
 
 class Text(ScreenObject):
+    __slots__ = ('text', 'centered')
+
     def __init__(self, x: int, y: int, text: str, x_delta=None, y_delta=None, centered=False, color=None):
         super().__init__(x, y, size=int(len(text) / 2), x_delta=x_delta, y_delta=y_delta, color=color)
         self.text = text
@@ -768,6 +1313,15 @@ class Border(ScreenObject):
         self.char = char
         self.show_fps = show_fps
         self.title = title
+
+        #: Cached cells of (x, y, char, color) for the frame, title and bars, and the layout they were built for
+        self._cells = []
+        self._layout = None
+
+        #: Cached cells for the status text, and the layout they were built for
+        self._status_cells = []
+        self._status_layout = None
+
         self.reset()
 
     def reset(self):
@@ -792,47 +1346,71 @@ class Border(ScreenObject):
     def render(self, screen: Screen):
         super().render(screen)
 
-        for x in range(screen.width):
-            for y in range(screen.height):
-                if x == 0 or y == 0 or x == screen.width - 1 or y == screen.height - 1:
-                    char = (self.char
-                            or (x == 0 and y == 0) and chr(0x2554)
-                            or (x == screen.width - 1 and y == 0) and chr(0x2557)
-                            or (x == 0 and y == screen.height - 1) and chr(0x255A)
-                            or (x == screen.width - 1 and y == screen.height - 1) and chr(0x255D)
-                            or (y == 0 or y == screen.height - 1) and chr(0x2550)
-                            or (x == 0 or x == screen.width - 1) and chr(0x2551))
-
-                    if self.health_level and x == 0 and y < screen.height - 1:
-                        y_level = int((screen.height - 1) * self.health_level + 0.5)
-                        if screen.height - 1 - y <= y_level:
-                            screen.draw(1, y, '│', color=screen.COLOR_RED)
-
-                    if self.energy_level and x == screen.width - 1 and y < screen.height - 1:
-                        y_level = int((screen.height - 2) * self.energy_level + 0.5)
-                        if screen.height - 1 - y <= y_level:
-                            screen.draw(screen.width - 2, y, '│', color=screen.COLOR_GREEN)
-
-                    screen.draw(x, y, char, color=self.color)
+        # Frame, title and bars are rasterized into cells that are only rebuilt when their layout changes
+        layout = (screen.width, screen.height, self.char, self.color, self.title, self.health_level,
+                  self.energy_level)
+        if layout != self._layout:
+            self._layout = layout
+            self._cells = [(x, y, char, color) for (x, y), (char, color) in self._rasterize(screen).items()]
+
+        if self.show_fps and screen.fps:
+            self.status['FPS'] = screen.fps
+
+        status_layout = (screen.width, screen.height, self.color, tuple(self.status.items()))
+        if status_layout != self._status_layout:
+            self._status_layout = status_layout
+            self._status_cells = []
+            if self.status:
+                debug_text = ' ' + ' | '.join(
+                    ['{}: {}'.format(k[0].upper() + k[1:], v) for k, v in self.status.items()]) + ' '
+                start_x = round((screen.width - len(debug_text)) / 2)
+                for x_offset in range(len(debug_text)):
+                    self._status_cells.append((start_x + x_offset, screen.height - 1, debug_text[x_offset],
+                                               self.color))
+
+        for x, y, char, color in self._cells:
+            screen.draw(x, y, char, color)
+
+        for x, y, char, color in self._status_cells:
+            screen.draw(x, y, char, color)
+
+    def _rasterize(self, screen: Screen):
+        """ Rasterize the frame, title and health/energy bars into a map of (x, y) to (char, color) """
+        width, height = screen.width, screen.height
+        cells = {}
+
+        for x in range(width):
+            cells[x, 0] = cells[x, height - 1] = (self.char or chr(0x2550), self.color)
+        for y in range(height):
+            cells[0, y] = cells[width - 1, y] = (self.char or chr(0x2551), self.color)
+        if not self.char:
+            cells[0, 0] = (chr(0x2554), self.color)
+            cells[width - 1, 0] = (chr(0x2557), self.color)
+            cells[0, height - 1] = (chr(0x255A), self.color)
+            cells[width - 1, height - 1] = (chr(0x255D), self.color)
+
+        if self.health_level:
+            y_level = int((height - 1) * self.health_level + 0.5)
+            for y in range(max(1, height - 1 - y_level), height - 1):
+                cells[1, y] = ('│', screen.COLOR_RED)
+
+        if self.energy_level:
+            y_level = int((height - 2) * self.energy_level + 0.5)
+            for y in range(max(1, height - 1 - y_level), height - 1):
+                cells[width - 2, y] = ('│', screen.COLOR_GREEN)
 
         if self.title:
             padded_title = ' ' + self.title + ' '
-            start_x = round((screen.width - len(padded_title)) / 2)
+            start_x = round((width - len(padded_title)) / 2)
             for x_offset in range(len(padded_title)):
-                screen.draw(start_x + x_offset, 0, padded_title[x_offset], color=self.color)
+                cells[start_x + x_offset, 0] = (padded_title[x_offset], self.color)
 
-        if self.show_fps and screen.fps:
-            self.status['FPS'] = screen.fps
-
-        if self.status:
-            debug_text = ' ' + ' | '.join(
-                ['{}: {}'.format(k[0].upper() + k[1:], v) for k, v in self.status.items()]) + ' '
-            start_x = round((screen.width - len(debug_text)) / 2)
-            for x_offset in range(len(debug_text)):
-                screen.draw(start_x + x_offset, screen.height - 1, debug_text[x_offset], color=self.color)
+        return cells
 
 
 class Char(ScreenObject):
+    __slots__ = ('char',)
+
     def __init__(self, *args, char, **kwargs):
         super().__init__(*args, **kwargs)
         self.char = char
@@ -847,6 +1425,8 @@ class Char(ScreenObject):
 
 
 class Projectile(ScreenObject):
+    __slots__ = ('shape', 'explode_after_renders', 'explosion', 'explosions')
+
     def __init__(self, x: int, y: int, shape='^', x_delta=None, y_delta=-1, color=None, size=1,
                  parent=None, explode_after_renders=None, explosion=None, explosions=1):
         super().__init__(x, y, color=color, x_delta=x_delta, y_delta=y_delta, size=size, parent=parent)
@@ -894,13 +1474,13 @@ class Circle(ScreenObject):
         self.char = char
         self.name = name
 
+    def make_template(self):
+        return ((-1, -1), (0, -1), (1, -1), (-2, 0), (2, 0), (-1, 1), (0, 1), (1, 1))
+
     def render(self, screen: Screen):
         super().render(screen)
 
-        self.coords = {(int(self.x - 1), int(self.y - 1)), (int(self.x), int(self.y - 1)),
-                       (int(self.x + 1), int(self.y - 1)), (int(self.x - 2), int(self.y)),
-                       (int(self.x + 2), int(self.y)), (int(self.x - 1), int(self.y + 1)),
-                       (int(self.x), int(self.y + 1)), (int(self.x + 1), int(self.y + 1))}
+        self.coords = self.place()
 
         for x, y in self.coords:
             screen.draw(x, y, self.char, color=self.color)
@@ -914,11 +1494,13 @@ class Diamond(ScreenObject):
         self.char = char
         self.name = name
 
+    def make_template(self):
+        return ((1, 0), (-1, 0), (0, 1), (0, -1))
+
     def render(self, screen: Screen):
         super().render(screen)
 
-        self.coords = {(int(self.x + 1), int(self.y)), (int(self.x - 1), int(self.y)),
-                       (int(self.x), int(self.y + 1)), (int(self.x), int(self.y - 1))}
+        self.coords = self.place()
 
         for x, y in self.coords:
             screen.draw(x, y, self.char, color=self.color)
@@ -933,22 +1515,24 @@ class Square(ScreenObject):
         self.name = name
         self.solid = solid
 
+    def make_template(self, size, solid):
+        return [(x, y) for x in range(int(size)) for y in range(int(size))
+                if solid or x == 0 or x == size - 1 or y == 0 or y == size - 1]
+
     def render(self, screen: Screen):
         super().render(screen)
 
         start_x = int(self.x - self.size / 2)
         start_y = int(self.y - self.size / 2)
-        self.coords = set()
+        self.coords = translate(self.template(self.size, self.solid), start_x, start_y)
 
-        for x in range(start_x, int(start_x + self.size)):
-            for y in range(start_y, int(start_y + self.size)):
-                if self.solid or (x == start_x or x == start_x + self.size - 1
-                                  or y == start_y or y == start_y + self.size - 1):
-                    self.coords.add((int(x), int(y)))
-                    screen.draw(x, y, self.char, color=self.color)
+        for x, y in self.coords:
+            screen.draw(x, y, self.char, color=self.color)
 
 
 class Explosion(ScreenObject):
+    __slots__ = ('current_size', 'char', 'on_finish')
+
     def __init__(self, x: int, y: int, size=10, char='*', on_finish=None, **kwargs):
         super().__init__(x, y, size=size, **kwargs)
 
@@ -989,6 +1573,199 @@ class Explosion(ScreenObject):
         self.current_size += 1
 
 
+class ParticleSystem(ScreenObject):
+    """
+    Swarm of particles, like flames, stored in parallel arrays and updated / drawn in one pass instead of as a screen
+    object per particle.
+
+    Each particle flies like a `Projectile` with an optional shape until its fuse burns out after the given number of
+    renders, then stops and bursts into the given number of rings that grow like an `Explosion` up to its size.
+    Coords of the shapes and rings drawn are used for collisions, and parts of particles that hit something are
+    removed with `hit`. The system removes itself once all of its particles are gone.
+    """
+    #: Lifetime of particles that never burst
+    FOREVER = 2 ** 31 - 1
+
+    #: Cached offsets of the cells on the edge of explosion rings by ring size
+    _rings = {}
+
+    def __init__(self, *args, char='*', shape=None, colors=None, on_finish=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        #: Char of the rings, shape of the particles (None to not show them), and colors to choose from for rings
+        self.char = char
+        self.shape = shape
+        self.colors = colors
+        self.on_finish = on_finish
+
+        self.xs = array('d')
+        self.ys = array('d')
+        self.x_deltas = array('d')
+        self.y_deltas = array('d')
+        self.ages = array('i')
+        self.fuses = array('i')
+        self.sizes = array('i')
+        self.bursts = array('i')
+        self.lifetimes = array('i')
+        #: Bitmask of rings that were removed for each particle
+        self.dead_rings = array('i')
+        self.particle_colors = []
+
+        #: List of (particle index, ring index or -1 for the shape, cells) drawn for the last render
+        self._cells = []
+
+    @property
+    def is_out(self):
+        return False  # Particles going out are removed instead
+
+    def emit(self, x, y, x_delta=0, y_delta=0, fuse=None, size=10, bursts=1, color=None):
+        """
+        Add a particle at the given position. It bursts after `fuse` renders into `bursts` rings (one per render)
+        that grow up to `size`, or never if `fuse` is None.
+        """
+        if fuse is None:
+            fuse = -1
+            lifetime = self.FOREVER
+        else:
+            lifetime = fuse + bursts - 1 + max(0, size - 1)
+
+        self.xs.append(x)
+        self.ys.append(y)
+        self.x_deltas.append(x_delta)
+        self.y_deltas.append(y_delta)
+        self.ages.append(0)
+        self.fuses.append(fuse)
+        self.sizes.append(size)
+        self.bursts.append(bursts)
+        self.lifetimes.append(lifetime)
+        self.dead_rings.append(0)
+        self.particle_colors.append(color)
+
+    @classmethod
+    def ring(cls, size):
+        """ Offsets of the cells on the edge of a size x size square that are within size distance of its center """
+        try:
+            return cls._rings[size]
+        except KeyError:
+            center = size / 2
+            cls._rings[size] = ring = [(x, y) for x in range(size) for y in range(size)
+                                       if (x in (0, size - 1) or y in (0, size - 1))
+                                       and (x - center) ** 2 + (y - center) ** 2 < size ** 2]
+            return ring
+
+    def render(self, screen: Screen):
+        super().render(screen)
+
+        xs, ys, x_deltas, y_deltas = self.xs, self.ys, self.x_deltas, self.y_deltas
+        ages, fuses, sizes, bursts = self.ages, self.fuses, self.sizes, self.bursts
+        lifetimes, dead_rings, particle_colors = self.lifetimes, self.dead_rings, self.particle_colors
+        shape = self.shape
+        char = self.char
+        ring_colors = self.colors or (screen.COLOR_YELLOW, screen.COLOR_RED)
+        width = screen.width
+        height = screen.height
+        draw = screen.draw
+        coords = set()
+        drawn = []
+        count = 0
+
+        for i in range(len(xs)):
+            age = ages[i] + 1
+            if age > lifetimes[i]:
+                continue
+
+            x = xs[i]
+            y = ys[i]
+            fuse = fuses[i]
+            if fuse < 0 or age <= fuse:
+                x += x_deltas[i]
+                y += y_deltas[i]
+                if x + 1 < 0 or x - 1 > width or y + 1 < 0 or y - 1 > height:
+                    continue
+
+            if shape is not None and (fuse < 0 or age < fuse + bursts[i]):
+                cells = [(int(x), int(y))]
+                draw(x, y, shape, color=particle_colors[i])
+                coords.update(cells)
+                drawn.append((count, -1, cells))
+
+            # Ring j was added on render fuse + j, and grows by one each render after that
+            if fuse >= 0 and age > fuse:
+                dead = dead_rings[i]
+                size = sizes[i]
+                for j in range(bursts[i]):
+                    ring_size = age - fuse - j + 1
+                    if ring_size < 2:
+                        break
+                    if ring_size > size or dead & (1 << j):
+                        continue
+
+                    ring = self.ring(ring_size)
+                    start_x = int(x - ring_size / 2)
+                    start_y = int(y - ring_size / 2)
+                    # Same number of cells on average as drawing each cell with a 2 / ring_size chance
+                    cells = [(start_x + ring_x, start_y + ring_y)
+                             for ring_x, ring_y in sample(ring, min(len(ring),
+                                                                    int(len(ring) * 2 / ring_size + random())))]
+                    for cell_x, cell_y in cells:
+                        draw(cell_x, cell_y, char, color=ring_colors)
+                    coords.update(cells)
+                    drawn.append((count, j, cells))
+
+            xs[count] = x
+            ys[count] = y
+            x_deltas[count] = x_deltas[i]
+            y_deltas[count] = y_deltas[i]
+            ages[count] = age
+            fuses[count] = fuse
+            sizes[count] = sizes[i]
+            bursts[count] = bursts[i]
+            lifetimes[count] = lifetimes[i]
+            dead_rings[count] = dead_rings[i]
+            particle_colors[count] = particle_colors[i]
+            count += 1
+
+        for particles in (xs, ys, x_deltas, y_deltas, ages, fuses, sizes, bursts, lifetimes, dead_rings,
+                          particle_colors):
+            del particles[count:]
+
+        self.coords = coords
+        self._cells = drawn
+
+        if not count:
+            self.remove()
+            if self.on_finish:
+                self.on_finish()
+
+    def hit(self, coords):
+        """
+        Remove the rings and shapes of particles drawn at any of the given coords for the last render. Particles
+        hit before they burst burst right away, like a `Projectile` that exploded on impact.
+        """
+        remaining = []
+        for i, j, cells in self._cells:
+            if coords.isdisjoint(cells):
+                remaining.append((i, j, cells))
+
+            elif j >= 0:
+                self.dead_rings[i] |= 1 << j
+
+            else:
+                age = self.ages[i]
+                fuse = self.fuses[i]
+                if fuse < 0:
+                    self.lifetimes[i] = age
+                else:
+                    if age < fuse:
+                        self.x_deltas[i] = self.y_deltas[i] = 0
+                        self.fuses[i] = fuse = age
+                    self.bursts[i] = age - fuse + 1
+                    self.lifetimes[i] = fuse + self.bursts[i] - 1 + max(0, self.sizes[i] - 1)
+
+        self._cells = remaining
+        self.coords = {cell for _, _, cells in remaining for cell in cells}
+
+
 class Triangle(ScreenObject):
     def __init__(self, x: int, y: int, size=5, char='^', x_delta=None, y_delta=None, color=None,
                  name=None):
@@ -997,20 +1774,23 @@ class Triangle(ScreenObject):
         self.char = char
         self.name = name
 
-    def render(self, screen: Screen):
-        super().render(screen)
+    def make_template(self, size):
+        offsets = [(0, -1)]
 
-        self.coords = {(int(self.x), int(self.y - 1))}
+        if size >= 2:
+            offsets.extend([(-1, 0), (1, 0)])
+            if size == 2:
+                offsets.append((0, 0))
 
-        if self.size >= 2:
-            self.coords.update({(int(self.x - 1), int(self.y)), (int(self.x + 1), int(self.y))})
-            if self.size == 2:
-                self.coords.update({(int(self.x), int(self.y))})
+        if size >= 3:
+            offsets.extend([(-1, 1), (0, 1), (1, 1), (-2, 1), (2, 1)])
+
+        return offsets
+
+    def render(self, screen: Screen):
+        super().render(screen)
 
-        if self.size >= 3:
-            self.coords.update({(int(self.x - 1), int(self.y + 1)), (int(self.x), int(self.y + 1)),
-                                (int(self.x + 1), int(self.y + 1)), (int(self.x - 2), int(self.y + 1)),
-                                (int(self.x + 2), int(self.y + 1))})
+        self.coords = self.place(self.size)
 
         for x, y in self.coords:
             screen.draw(x, y, self.char, color=self.color)
@@ -1023,15 +1803,17 @@ class Bar(ScreenObject):
                          size=size, parent=parent)
         self.char = char
 
+    def make_template(self, size):
+        return [(x, 0) for x in range(int(size))]
+
     def render(self, screen: Screen):
         super().render(screen)
 
         start_x = int(self.x - self.size / 2 - 0.5)  # Round down
-        self.coords = set()
+        self.coords = translate(self.template(self.size), start_x, int(self.y))
 
-        for x in range(start_x, int(start_x + self.size)):
-            self.coords.add((int(x), int(self.y)))
-            screen.draw(x, self.y, self.char, color=self.color)
+        for x, y in self.coords:
+            screen.draw(x, y, self.char, color=self.color)
 
 
 class Choice(ScreenObject, KeyListener):
@@ -1533,23 +2315,11 @@ class Volcano(Bitmap):
 """  # noqa
 
 
-class Flame(ScreenObject):
+class Flame(ParticleSystem):
     def render_init(self, screen: Screen):
-        for flame_size in range(self.size):
-            explosion = Explosion(self.x, self.y, size=flame_size, parent=self)
-            projectile = Projectile(self.x, self.y, shape=None, parent=self,
-                                    x_delta=self.x_delta * (1 + flame_size / 20),
-                                    y_delta=self.y_delta, color=screen.COLOR_YELLOW,
-                                    explode_after_renders=flame_size,
-                                    explosion=explosion)
-            self.add_kid(projectile)
-            screen.add(projectile)
-
-    def render(self, screen: Screen):
-        super().render(screen)
-
-        if not self.kids:  # Flamed out (explosions/projectiles are gone)
-            self.remove()
+        for flame_size in range(1, self.size):
+            self.emit(self.x, self.y, x_delta=self.x_delta * (1 + flame_size / 20), y_delta=self.y_delta,
+                      fuse=flame_size, size=flame_size)
 
 
 class VolcanoErupting(ScreenObject):
@@ -1711,6 +2481,7 @@ class Spinner(Object3D):
 
 class Landscape(ObjectMap, KeyListener):
     move_speed = 0
+    prerender = True
     object_map = {
         'S': Sun,
         'T': Tree,
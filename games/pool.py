@@ -0,0 +1,86 @@
+import gc
+
+
+class ObjectPool:
+    """
+    Pool of screen objects that are reused once they are removed from the screen instead of allocating new ones for
+    short-lived objects, like projectiles and particle systems that are created every frame.
+
+    Objects are acquired from the pool with `ScreenObject.acquire`, and the screen releases them back at the end of
+    the frame they were removed in.
+    """
+    #: Names of the slots of each class, including those of its bases
+    _slots = {}
+
+    def __init__(self, max_size=1000):
+        #: Max number of free objects to keep per class
+        self.max_size = max_size
+
+        #: Free objects by class
+        self._free = {}
+
+        #: Number of objects created / reused / released by the pool
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+
+    def __len__(self):
+        return sum(len(free) for free in self._free.values())
+
+    def acquire(self, cls, *args, **kwargs):
+        """ Get a free object of the given class re-initialized with the given args, or create one if none is free """
+        free = self._free.get(cls)
+        if free:
+            obj = free.pop()
+            self.clear_attributes(obj)
+            obj.__init__(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = cls(*args, **kwargs)
+            self.created += 1
+
+        obj._pooled = True
+        return obj
+
+    @staticmethod
+    def clear_attributes(obj):
+        """ Remove all attributes of the object so nothing from its last use carries over when it is re-initialized """
+        try:
+            slots = ObjectPool._slots[type(obj)]
+        except KeyError:
+            slots = ObjectPool._slots[type(obj)] = [name for cls in type(obj).__mro__
+                                                    for name in cls.__dict__.get('__slots__', ())]
+
+        for name in slots:
+            try:
+                delattr(obj, name)
+            except AttributeError:
+                pass
+
+        if hasattr(obj, '__dict__'):
+            obj.__dict__.clear()
+
+    def release(self, obj):
+        """ Release an object acquired from the pool so it can be reused """
+        if not obj._pooled:
+            return
+
+        obj._pooled = False
+        free = self._free.setdefault(type(obj), [])
+        if len(free) < self.max_size:
+            free.append(obj)
+            self.released += 1
+
+    def clear(self):
+        """ Drop all free objects """
+        self._free.clear()
+
+    def stats(self):
+        """ Allocation stats of the pool and number of garbage collections done by the interpreter """
+        return {'created': self.created, 'reused': self.reused, 'released': self.released, 'free': len(self),
+                'collections': sum(stats['collections'] for stats in gc.get_stats()),
+                'gc counts': gc.get_count()}
+
+
+#: Default pool shared by all screen objects
+pool = ObjectPool()
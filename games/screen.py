@@ -1,19 +1,44 @@
-from collections import deque
+from array import array
+from collections import deque, OrderedDict
 import curses
+import os
 from random import choice
-from time import sleep, time
+from select import select
+import signal
+import sys
+import termios
+from time import monotonic, sleep
+import tty
 
 from games.listeners import KeyListener
+from games.pool import pool
+
+try:
+    import numpy
+except ImportError:  # Optional to vectorize frame diffs for CompactScreenBuffer
+    numpy = None
 
 
 class Screen:
     #: Special rainbow color
     COLOR_RAINBOW = (-1,)
 
-    def __init__(self, border=None, fps=30, debug=False):
+    #: Max number of frames to skip in a row when ticks fall behind schedule
+    MAX_FRAME_SKIP = 5
+
+    #: Max seconds to catch up on when ticks fall behind (e.g. after suspend) before dropping the missed ticks
+    MAX_LAG_SECS = 0.25
+
+    def __init__(self, border=None, fps=30, debug=False, compact=False, tick_rate=30):
         #: FPS limit to render
         self.fps_limit = fps
 
+        #: Simulation ticks per second that game logic runs at, independent of the FPS rendered
+        self.tick_rate = tick_rate
+
+        #: Use a compact array-backed buffer for frames
+        self.compact = compact
+
         #: Width of the screen
         self._width = None
 
@@ -26,17 +51,29 @@ class Screen:
         #: Buffer for next frame to display
         self.buffer = None
 
-        #: Number of times the screen has rendered
+        #: Terminal was resized (set by KEY_RESIZE / SIGWINCH) and the screen should be resized on next render
+        self._resized = False
+
+        #: Number of simulation ticks that the screen has rendered objects for (drawn or not)
         self.renders = 0
 
-        #: Tracks the last N render times
-        self._render_secs = deque(maxlen=30)
+        #: Tracks the times of the last N frames drawn
+        self._frame_times = deque(maxlen=30)
+
+        #: Draw objects onto the buffer for the current tick
+        self._drawing = True
 
         #: Show debug info
         self._debug = debug
 
-        #: List of screen objects
-        self._objects = []
+        #: Registry of screen objects in the order added, for O(1) membership and removal
+        self._objects = OrderedDict()
+
+        #: Screen objects to remove once the current frame has rendered
+        self._removals = deque()
+
+        #: Removed objects from the object pool to release back to it once the current frame has rendered
+        self._released = deque()
 
         #: Game controller
         self.controller = None
@@ -50,6 +87,9 @@ class Screen:
             'rainbow': self.COLOR_RAINBOW}
         self.rainbow_colors = []
 
+        #: Map of colors to color pair ids resolved by `resolve_color`. Cleared when colors are populated.
+        self._color_lut = {}
+
         self.reset()
 
     def __contains__(self, screen_object):
@@ -71,12 +111,16 @@ class Screen:
 
     @property
     def key(self):
-        return self._screen.getch()
+        key = self._screen.getch()
+        if key == curses.KEY_RESIZE:
+            self._resized = True
+            key = self._screen.getch()
+        return key
 
     @property
     def fps(self):
-        if self._render_secs:
-            return round(1 / (sum(self._render_secs) / len(self._render_secs)))
+        if len(self._frame_times) > 1 and self._frame_times[-1] > self._frame_times[0]:
+            return round((len(self._frame_times) - 1) / (self._frame_times[-1] - self._frame_times[0]))
 
     @property
     def status(self):
@@ -102,6 +146,7 @@ class Screen:
             setattr(self, color_name, curses.color_pair(color_id))
             self.colors[color.lower()] = getattr(self, color_name)
             self.rainbow_colors.append(getattr(self, color_name))
+        self._color_lut.clear()
 
         return self
 
@@ -112,112 +157,205 @@ class Screen:
         curses.endwin()
 
     def add(self, *screen_objects):
-        """ Add screen objects to the list """
+        """ Add screen objects to the registry """
         for obj in screen_objects:
-            self._objects.append(obj)
+            self._objects[obj] = None
             if isinstance(obj, KeyListener) and self.controller:
                 self.controller.key_listeners.add(obj)
 
     def remove(self, *screen_objects):
-        """ Remove screen objects from the list """
+        """ Remove screen objects from the registry """
         for screen_object in screen_objects:
-            try:
-                index = self._objects.index(screen_object)
-            except ValueError:
+            if screen_object not in self._objects:
                 continue
 
             if screen_object and self.controller and screen_object in self.controller.key_listeners:
                 self.controller.key_listeners.remove(screen_object)
 
-            obj = self._objects.pop(index)
-            for kid in obj.kids:
+            del self._objects[screen_object]
+            if screen_object._pooled:
+                self._released.append(screen_object)
+            for kid in screen_object._kids or ():
                 self.remove(kid)
 
+    def remove_later(self, *screen_objects):
+        """ Queue screen objects to remove from their parent and the screen after the current frame renders """
+        self._removals.extend(screen_objects)
+
     def replace(self, old_object, new_object):
         self.remove(old_object)
         self.add(new_object)
 
     def reset(self, border=False):
-        self._objects = []
+        self._objects = OrderedDict()
+        self._removals.clear()
         self.renders = 0
-        self._start_time = time()
         if self.border and border:
             self.border.reset()
 
+    def terminal_size(self):
+        """ Return the (height, width) of the terminal """
+        return self._screen.getmaxyx()
+
+    def clear_terminal(self):
+        """ Clear everything on the terminal """
+        self._screen.clear()
+
     def resize_screen(self, when_changed=False):
-        max_height, max_width = self._screen.getmaxyx()
+        """
+        Resize the screen to the terminal size, or only when it changed if `when_changed` is set. Objects on screen
+        are laid out again for the new size in place, so the current scene keeps going.
+        """
+        max_height, max_width = self.terminal_size()
         max_height -= 1  # Seems to be off by one
 
         if (not when_changed or max_width != self._width or max_height != self._height):
+            old_width, old_height = self._width, self._height
             self._height = max_height
             self._width = max_width
-            self._screen.clear()
-            self.buffer = ScreenBuffer(max_width, max_height)
-            if self.controller:
-                self.controller.reset_scene()
+            self.clear_terminal()
+
+            if self.buffer:
+                self.buffer.resize(max_width, max_height)
+            else:
+                self.buffer = (CompactScreenBuffer if self.compact else ScreenBuffer)(max_width, max_height)
+
+            if old_width and (old_width, old_height) != (max_width, max_height):
+                for obj in self:
+                    obj.relayout(old_width, old_height, max_width, max_height)
+
+    def resolve_color(self, color):
+        """
+        Resolve the given color name, list of color names, rainbow or color pair id into a color pair id, or a tuple
+        of color pair ids to randomly choose from when drawing. Results are cached in the color lookup table, where
+        lists of colors are keyed by their tuple.
+        """
+        if type(color) is list:
+            color = tuple(color)
+
+        resolved = color
+        if type(color) is tuple and isinstance(color[0], str):
+            resolved = tuple(self.resolve_color(c) for c in color)
+        elif color in self.colors:
+            resolved = self.resolve_color(self.colors[color])
+        elif color == self.COLOR_RAINBOW:
+            resolved = tuple(self.rainbow_colors)
+
+        if isinstance(resolved, str):
+            raise ValueError(('Invalid color name: {}\n'
+                              'Please choose from: {}').format(color, ', '.join(self.colors)))
+
+        self._color_lut[color] = resolved
+
+        return resolved
 
     def draw(self, x: int, y: int, char: str, color=None):
         """ Draw character on the given position """
-        if x >= 0 and x < self._width and y >= 0 and y < self._height:
-            if type(color) in (tuple, list) and isinstance(color[0], str):
-                color = self.colors[choice(color)]
-            if color in self.colors:
-                color = self.colors[color]
-            if color == self.COLOR_RAINBOW:
-                color = choice(self.rainbow_colors)
-
-            if isinstance(color, str):
-                raise ValueError(('Invalid color name: {}\n'
-                                  'Please choose from: {}').format(color, ', '.join(self.colors)))
+        if self._drawing and x >= 0 and x < self._width and y >= 0 and y < self._height:
+            if type(color) is list:
+                color = tuple(color)  # Lists can't be looked up
+            try:
+                color = self._color_lut[color]
+            except KeyError:
+                color = self.resolve_color(color)
+            if type(color) is tuple:
+                color = choice(color)
 
             self.buffer.add(x, y, char, color)
 
-    def render(self):
-        start_time = time()
-
-        self._render()
-
-        render_time = time() - start_time
-        # self.debug(secs_to_render_fps_limit=round(render_time * self.fps_limit, 1))
-
-        # Sleep to ensure FPS doesn't exceed set limit
-        sleep_time = 1 / self.fps_limit - render_time
-        if sleep_time > 1 / self.fps_limit * 0.1:
-            sleep(sleep_time)
-            render_time += sleep_time
+    def play(self, controller):
+        """
+        Run the controller's game loop until it is done. Simulation ticks run at a fixed `tick_rate` so game speed
+        doesn't change with the FPS, while frames are drawn at up to `fps_limit` and skipped when ticks fall behind.
+        """
+        tick_secs = 1 / self.tick_rate
+        frame_secs = 1 / self.fps_limit
+        next_tick = next_frame = monotonic()
+        frames_skipped = 0
+
+        while not controller.done:
+            now = monotonic()
+            if now < next_tick:
+                sleep(next_tick - now)
+                now = next_tick
+            elif now - next_tick > self.MAX_LAG_SECS:
+                next_tick = now
+            next_tick += tick_secs
+
+            behind = next_tick <= now
+            draw = now >= next_frame and (not behind or frames_skipped >= self.MAX_FRAME_SKIP)
+            if draw:
+                next_frame = max(next_frame + frame_secs, now - frame_secs)
+                frames_skipped = 0
+            else:
+                frames_skipped += behind
+
+            self.render(draw=draw)
+            controller.play()
+
+    def render(self, draw=True):
+        """ Render objects for one simulation tick, and draw them onto the terminal if `draw` is True """
+        self._drawing = draw
+        try:
+            self._render()
+        finally:
+            self._drawing = True
 
         self.renders += 1
-        self._render_secs.append(render_time)
+        if draw:
+            self._frame_times.append(monotonic())
 
     def _render(self):
-        if self.renders % self.fps_limit == 0:
+        if self._resized:
+            self._resized = False
             self.resize_screen(when_changed=True)
 
-        self.buffer.clear()
+        if self._drawing:
+            self.buffer.clear()
 
-        for obj in list(self):
+        for obj in list(self._objects):
             if obj.is_out:
-                if obj.parent:
-                    try:
-                        obj.parent.kids.remove(obj)
-                    except Exception:
-                        pass
-                self.remove(obj)
+                self._removals.append(obj)
             elif obj.visible:
                 obj.render(self)
 
+        while self._removals:
+            obj = self._removals.popleft()
+            if obj.parent:
+                try:
+                    obj.parent.kids.remove(obj)
+                except Exception:
+                    pass
+            self.remove(obj)
+
+        # Objects still on screen or held as a kid are in use, so they can't be reused yet.
+        while self._released:
+            obj = self._released.popleft()
+            if obj not in self._objects and not obj._holders:
+                pool.release(obj)
+
+        if not self._drawing:
+            return
+
         if self.border:
             if self._debug:
                 self.border.status['objects'] = len(self)
+                self.border.status['allocated'] = pool.created
             self.border.render(self)
 
         try:
-            self.buffer.render(self._screen, self)
+            self.render_buffer()
         except Exception:
             if self._debug:
                 raise
             self.resize_screen()
 
+    def render_buffer(self):
+        """ Render changes in the buffer onto the terminal """
+        self.buffer.render(self._screen, self)
+        if self._debug:
+            self.border.status['saved calls'] = self.buffer.calls_saved
+
     def debug(self, **debug_info):
         """ Show debug info (enabled when --debug flag is used) or start debugger """
         if debug_info:
@@ -230,12 +368,246 @@ class Screen:
             curses.noecho()  # Remove echo after continuing
 
 
+class AnsiScreen(Screen):
+    """ Screen that renders using raw ANSI escape sequences instead of curses, writing each frame in one go """
+
+    #: SGR codes for foreground colors
+    SGR_COLORS = {'RED': 31, 'GREEN': 32, 'YELLOW': 33, 'BLUE': 34, 'MAGENTA': 35, 'CYAN': 36}
+
+    #: Escape sequences of keys mapped to curses key codes
+    KEY_SEQUENCES = {'[A': curses.KEY_UP, '[B': curses.KEY_DOWN, '[C': curses.KEY_RIGHT, '[D': curses.KEY_LEFT,
+                     'OA': curses.KEY_UP, 'OB': curses.KEY_DOWN, 'OC': curses.KEY_RIGHT, 'OD': curses.KEY_LEFT}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        #: Keys read from the terminal but not consumed yet
+        self._keys = deque()
+
+        #: Number of bytes written for the last frame
+        self.bytes_written = 0
+
+        #: Current SGR color of the terminal
+        self._color = None
+
+    @property
+    def key(self):
+        if not self._keys and select([self._input], [], [], 0)[0]:
+            self._read_keys(os.read(self._input, 1024).decode(errors='ignore'))
+        return self._keys.popleft() if self._keys else -1
+
+    def _read_keys(self, chars):
+        while chars:
+            if chars[0] == '\x1b' and chars[1:3] in self.KEY_SEQUENCES:
+                self._keys.append(self.KEY_SEQUENCES[chars[1:3]])
+                chars = chars[3:]
+            else:
+                self._keys.append(10 if chars[0] == '\r' else ord(chars[0]))
+                chars = chars[1:]
+
+    def __enter__(self):
+        self._input = sys.stdin.fileno()
+        self._output = sys.stdout.fileno()
+        self._terminal_attrs = termios.tcgetattr(self._input)
+        tty.setcbreak(self._input)
+        self._write('\x1b[?1049h\x1b[?25l')  # Switch to alternate screen and hide cursor
+        self._sigwinch_handler = signal.signal(signal.SIGWINCH, self._on_resize)
+
+        self.resize_screen()
+
+        self.rainbow_colors = []
+        for color, sgr in self.SGR_COLORS.items():
+            color_name = 'COLOR_' + color
+            setattr(self, color_name, sgr)
+            self.colors[color.lower()] = sgr
+            self.rainbow_colors.append(sgr)
+        self._color_lut.clear()
+
+        return self
+
+    def __exit__(self, *args):
+        self._write('\x1b[0m\x1b[?25h\x1b[?1049l')  # Reset color, show cursor, and switch back to main screen
+        termios.tcsetattr(self._input, termios.TCSADRAIN, self._terminal_attrs)
+        signal.signal(signal.SIGWINCH, self._sigwinch_handler)
+
+    def _on_resize(self, signum, frame):
+        self._resized = True
+
+    def _write(self, text):
+        """ Write the text to the terminal and return the number of bytes written """
+        data = text.encode()
+        size = len(data)
+        while data:
+            data = data[os.write(self._output, data):]
+        return size
+
+    def terminal_size(self):
+        # Ask the terminal itself, as COLUMNS / LINES env vars used by shutil.get_terminal_size could be stale
+        try:
+            columns, lines = os.get_terminal_size(self._output)
+        except OSError:
+            if not self._width:
+                return 25, 80
+            return self._height + 1, self._width
+        return lines, columns
+
+    def clear_terminal(self):
+        self._write('\x1b[0m\x1b[2J')
+        self._color = None
+
+    def encode(self, runs):
+        """ Encode the runs from `ScreenBuffer.diff` into escape sequences wrapped as a synchronized update """
+        frame = ['\x1b[?2026h']
+        cursor = None
+
+        for y, x, text, color in runs:
+            if color is ScreenBuffer.BLANK:
+                color = None
+
+            if cursor != (y, x):
+                if cursor and cursor[0] == y and cursor[1] < x:
+                    frame.append('\x1b[{}C'.format(x - cursor[1]))
+                else:
+                    frame.append('\x1b[{};{}H'.format(y + 1, x + 1))
+
+            if color != self._color:
+                frame.append('\x1b[{}m'.format(color or 39))
+                self._color = color
+
+            frame.append(text)
+            cursor = (y, x + len(text))
+
+        frame.append('\x1b[?2026l')
+        return ''.join(frame)
+
+    def render_buffer(self):
+        runs = self.buffer.diff()
+        self.bytes_written = self._write(self.encode(runs)) if runs else 0  # Nothing to write when nothing changed
+        self.debug(bytes=self.bytes_written)
+
+    def debug(self, **debug_info):
+        if debug_info:
+            super().debug(**debug_info)
+        else:
+            self.__exit__()
+            import pdb
+            pdb.set_trace()
+            self.__enter__()
+
+
+class HeadlessScreen(Screen):
+    """
+    Screen that renders in memory without a terminal and doesn't limit FPS, so games can be simulated as fast as
+    possible. Keys to play with are queued using `press`.
+    """
+    def __init__(self, *args, width=80, height=20, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        #: Queue of (frame, key) where key is pressed once the given frame has been rendered
+        self.keys = deque()
+
+        #: Number of frames rendered, which unlike `renders`, is not reset with the screen.
+        self.frames = 0
+
+        self._terminal_size = (height + 1, width)
+        self.resize_screen()
+
+        # Same color pair ids as curses
+        for color in ('RED', 'GREEN', 'BLUE', 'YELLOW', 'CYAN', 'MAGENTA'):
+            color_name = 'COLOR_' + color
+            setattr(self, color_name, getattr(curses, color_name) << 8)
+            self.colors[color.lower()] = getattr(self, color_name)
+            self.rainbow_colors.append(getattr(self, color_name))
+        self._color_lut.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    @property
+    def key(self):
+        if self.keys and self.keys[0][0] <= self.frames:
+            return self.keys.popleft()[1]
+        return -1
+
+    def press(self, *keys, after=0):
+        """ Press the given keys (chars or key codes) after the given number of frames """
+        for key in keys:
+            self.keys.append((self.frames + after, ord(key) if isinstance(key, str) else key))
+
+    def resize(self, width, height):
+        """ Resize the terminal, which the screen picks up on next render like it would for SIGWINCH """
+        self._terminal_size = (height + 1, width)
+        self._resized = True
+
+    def terminal_size(self):
+        return self._terminal_size
+
+    def clear_terminal(self):
+        pass
+
+    def play(self, controller):
+        """ Run the controller's game loop without waiting between ticks and draw every frame """
+        while not controller.done:
+            self.render()
+            controller.play()
+
+    def render(self, draw=True):
+        super().render(draw=draw)
+        self.frames += 1
+
+    def render_buffer(self):
+        self.buffer.diff()
+
+
 class ScreenBuffer:
+    #: Color of runs of blank cells returned by `diff`
+    BLANK = 'blank'
+
     def __init__(self, width: int, height: int):
         self.width = width
         self.height = height
+        self.changed_cells = 0
+        self.calls_saved = 0
+
+        #: Front buffer with what is currently on screen
         self.screen = self._new_buffer()
-        self.clear()
+
+        #: Back buffer for the next frame. Front and back are swapped after each render to avoid reallocating.
+        self.buffer = self._new_buffer()
+
+        #: Rows that have been drawn on in the back buffer / front buffer
+        self.dirty_rows = [False] * height
+        self._screen_dirty_rows = [False] * height
+
+        #: A row without anything drawn on it
+        self._blank_row = [(None, None)] * width
+        self._blank_hash = hash(tuple(self._blank_row))
+
+        #: Hash of each row currently on screen, used to skip rows that haven't changed
+        self.row_hashes = [self._blank_hash] * height
+
+    def resize(self, width: int, height: int):
+        """ Resize for a cleared terminal, reusing rows in place when the width is unchanged """
+        if width != self.width:
+            self.__init__(width, height)
+            return
+
+        for y in range(min(height, self.height)):
+            if self.dirty_rows[y]:
+                self.buffer[y][:] = self._blank_row
+            if self.row_hashes[y] != self._blank_hash:
+                self.screen[y][:] = self._blank_row
+        for buffer in (self.screen, self.buffer):
+            del buffer[height:]
+            buffer.extend([(None, None)] * width for _ in range(height - len(buffer)))
+
+        self.height = height
+        self.dirty_rows = [False] * height
+        self._screen_dirty_rows = [False] * height
+        self.row_hashes = [self._blank_hash] * height
 
     def _new_buffer(self):
         buffer = []
@@ -244,33 +616,195 @@ class ScreenBuffer:
         return buffer
 
     def add(self, x, y, char, color=None):
-        self.buffer[int(y)][int(x)] = (char, color)
+        y = int(y)
+        self.buffer[y][int(x)] = (char, color)
+        self.dirty_rows[y] = True
 
     def clear(self):
-        self.buffer = self._new_buffer()
+        """ Clear the rows drawn on in the back buffer in place """
+        for y, dirty in enumerate(self.dirty_rows):
+            if dirty:
+                self.buffer[y][:] = self._blank_row
+                self.dirty_rows[y] = False
+
+    def diff(self):
+        """
+        Swap the buffer onto the screen and return the changes as runs of (y, x, text, color), where each run is
+        a sequence of adjacent changed cells that share the same color. Blank cells are returned as runs of spaces
+        with color set to `BLANK`.
+        """
+        runs = []
+        self.changed_cells = 0
 
-    def render(self, curses_screen, screen: Screen):
-        blanks = set()
-        for x in range(self.width):
-            for y in range(self.height):
-                if self.buffer[y][x] != self.screen[y][x]:
-                    self.screen[y][x] = self.buffer[y][x]
-                    char, color = self.buffer[y][x]
-                    if char:
-                        if color:
-                            curses_screen.addch(y, x, char, color)
-                        else:
-                            curses_screen.addch(y, x, char)
+        for y in range(self.height):
+            # Rows not drawn on are blank, so they only need updating if the screen row isn't blank.
+            row_hash = hash(tuple(self.buffer[y])) if self.dirty_rows[y] else self._blank_hash
+            if row_hash == self.row_hashes[y]:
+                continue
+            self.row_hashes[y] = row_hash
+
+            row = self.buffer[y]
+            screen_row = self.screen[y]
+            run = None
+            for x in range(self.width):
+                if row[x] != screen_row[x]:
+                    self.changed_cells += 1
+                    char, color = row[x]
+                    if not char:
+                        char, color = ' ', self.BLANK
+
+                    if run and run[3] == color and run[1] + len(run[2]) == x:
+                        run[2].append(char)
                     else:
-                        curses_screen.addch(y, x, '.')  # Need to write something before erasing to work 100%
-                        blanks.add((y, x))
+                        run = [y, x, [char], color]
+                        runs.append(run)
+
+        self.screen, self.buffer = self.buffer, self.screen
+        self.dirty_rows, self._screen_dirty_rows = self._screen_dirty_rows, self.dirty_rows
+
+        return [(y, x, ''.join(chars), color) for y, x, chars, color in runs]
+
+    def render(self, curses_screen, screen: Screen):
+        runs = self.diff()
+        blanks = []
+
+        for y, x, text, color in runs:
+            if color is self.BLANK:
+                curses_screen.addstr(y, x, '.' * len(text))  # Need to write something before erasing to work 100%
+                blanks.append((y, x, text))
+            elif color:
+                curses_screen.addstr(y, x, text, color)
+            else:
+                curses_screen.addstr(y, x, text)
 
         curses_screen.refresh()
         if blanks:
-            for y, x in blanks:
-                curses_screen.addch(y, x, ' ')  # for macBook Pro console, otherwise some artifacts are left behind.
+            for y, x, text in blanks:
+                curses_screen.addstr(y, x, text)  # for macBook Pro console, otherwise some artifacts are left behind.
             curses_screen.refresh()
 
+        #: Number of curses calls saved in the last frame by writing runs instead of single characters
+        self.calls_saved = self.changed_cells - len(runs) + sum(len(text) - 1 for _, _, text in blanks)
+
+
+class CompactScreenBuffer(ScreenBuffer):
+    """
+    Screen buffer that stores code points and color pair ids in flat `array('I')` instead of rows of (char, color)
+    tuples, so nothing is allocated per frame. Frame diffs are vectorized when NumPy is installed.
+    """
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.changed_cells = 0
+        self.calls_saved = 0
+
+        #: Code points and color pair ids of what is currently on screen
+        self.screen_chars = self._new_array()
+        self.screen_colors = self._new_array()
+
+        #: Code points and color pair ids for the next frame
+        self.chars = self._new_array()
+        self.colors = self._new_array()
+
+        #: Rows that have been drawn on in the back buffer / front buffer
+        self.dirty_rows = [False] * height
+        self._screen_dirty_rows = [False] * height
+
+        self._blank = self._new_array()
+        self._blank_row = array('I', [0]) * width
+
+    def _new_array(self):
+        return array('I', [0]) * (self.width * self.height)
+
+    def resize(self, width: int, height: int):
+        if width != self.width:
+            self.__init__(width, height)
+            return
+
+        self.height = height
+        self._blank = self._new_array()
+        for cells in (self.screen_chars, self.screen_colors, self.chars, self.colors):
+            cells[:] = self._blank
+        self.dirty_rows = [False] * height
+        self._screen_dirty_rows = [False] * height
+
+    @property
+    def screen(self):
+        """ Rows of (char, color) currently on screen """
+        rows = []
+        for start in range(0, self.width * self.height, self.width):
+            end = start + self.width
+            rows.append([(chr(char) if char else None, color or None)
+                         for char, color in zip(self.screen_chars[start:end], self.screen_colors[start:end])])
+        return rows
+
+    def add(self, x, y, char, color=None):
+        y = int(y)
+        index = y * self.width + int(x)
+        self.chars[index] = ord(char) if char else 0
+        self.colors[index] = color or 0
+        self.dirty_rows[y] = True
+
+    def clear(self):
+        """ Clear the rows drawn on in the back buffer in place """
+        width = self.width
+        for y, dirty in enumerate(self.dirty_rows):
+            if dirty:
+                start = y * width
+                end = start + width
+                self.chars[start:end] = self._blank_row
+                self.colors[start:end] = self._blank_row
+                self.dirty_rows[y] = False
+
+    def changed(self):
+        """ Return the indices of the cells that differ between the buffer and the screen """
+        if numpy:
+            chars, screen_chars, colors, screen_colors = (
+                numpy.frombuffer(a, dtype=numpy.uint32)
+                for a in (self.chars, self.screen_chars, self.colors, self.screen_colors))
+            return numpy.flatnonzero((chars != screen_chars) | (colors != screen_colors)).tolist()
+
+        changed = []
+        for y in range(self.height):
+            if self.dirty_rows[y] or self._screen_dirty_rows[y]:
+                start = y * self.width
+                end = start + self.width
+                chars = self.chars[start:end]
+                screen_chars = self.screen_chars[start:end]
+                colors = self.colors[start:end]
+                screen_colors = self.screen_colors[start:end]
+                if chars != screen_chars or colors != screen_colors:
+                    changed.extend(i for i, a, b, c, d in zip(range(start, end), chars, screen_chars, colors,
+                                                              screen_colors) if a != b or c != d)
+        return changed
+
+    def diff(self):
+        changed = self.changed()
+        self.changed_cells = len(changed)
+
+        runs = []
+        run = None
+        for index in changed:
+            y, x = divmod(index, self.width)
+            char = self.chars[index]
+            color = self.colors[index]
+            if char:
+                char = chr(char)
+            else:
+                char, color = ' ', self.BLANK
+
+            if run and run[3] == color and run[0] == y and run[1] + len(run[2]) == x:
+                run[2].append(char)
+            else:
+                run = [y, x, [char], color]
+                runs.append(run)
+
+        self.screen_chars, self.chars = self.chars, self.screen_chars
+        self.screen_colors, self.colors = self.colors, self.screen_colors
+        self.dirty_rows, self._screen_dirty_rows = self._screen_dirty_rows, self.dirty_rows
+
+        return [(y, x, ''.join(chars), color) for y, x, chars, color in runs]
+
 
 class Scene(KeyListener):
     def __init__(self, screen, controller):
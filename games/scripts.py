@@ -5,7 +5,10 @@ from games.manager import Manager
 
 @click.command()
 @click.argument('game', required=False)
-@click.option('--fps', type=int, default=30, help='Set the frames per second to render')
+@click.option('--fps', type=int, default=30, help='Set the max frames per second to render (game speed stays the same)')
 @click.option('--debug', is_flag=True, help='Turn on debug mode')
-def main(game, fps, debug):
-    Manager().start(game_filter=game, fps=fps, debug=debug)
+@click.option('--compact', is_flag=True, help='Use a compact array-backed frame buffer')
+@click.option('--backend', type=click.Choice(sorted(Manager.backends)), default='curses',
+              help='Set the backend to render with')
+def main(game, fps, debug, compact, backend):
+    Manager().start(game_filter=game, fps=fps, debug=debug, compact=compact, backend=backend)
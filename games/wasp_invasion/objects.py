@@ -114,8 +114,8 @@ class Player(AbstractPlayer):
 
                 if self.gas > 0:
                     size = min(15, int(screen.width / 9))
-                    flame = Flame(self.x, self.y, x_delta=x_delta, y_delta=y_delta, size=size,
-                                  parent=self)
+                    flame = Flame.acquire(self.x, self.y, x_delta=x_delta, y_delta=y_delta, size=size,
+                                          parent=self)
                     self.add_kid(flame)
                     self.screen.add(flame)
 
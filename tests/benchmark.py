@@ -0,0 +1,123 @@
+"""
+Benchmarks behind the performance changes, which compare each optimized path with the work it replaced.
+
+Run from the repo root, e.g. `python -m tests.benchmark colors`. Timings are the best of several repeats, as they
+vary a lot between runs on a busy machine.
+"""
+import gc
+import tracemalloc
+from random import Random
+from timeit import repeat
+
+import click
+
+from games.coords import SpatialHash, translate
+from games.objects import Bitmap, Border, Char, Cube, Explosion, Helicopter, Projectile, ScreenObject, Square, Text
+from games.screen import HeadlessScreen
+
+
+def best(func, number=1000, repeats=7):
+    """ Return the best time in seconds of calling the function once """
+    return min(repeat(func, number=number, repeat=repeats)) / number
+
+
+def show(name, *timings):
+    click.echo('{:<40} {}'.format(name, ' -> '.join('{:>8.2f} us'.format(secs * 1e6) for secs in timings)))
+
+
+@click.group()
+def main():
+    pass
+
+
+@main.command()
+def colors():
+    """ Screen.draw with the color lookup table vs resolving the color on every draw """
+    screen = HeadlessScreen(border=Border(), width=120, height=40)
+
+    def resolving(draw):
+        def draw_resolved():
+            screen._color_lut.clear()
+            draw()
+        return draw_resolved
+
+    name = lambda: screen.draw(5, 5, 'X', 'red')  # noqa: E731
+    names = lambda: screen.draw(5, 5, 'X', ['red', 'yellow'])  # noqa: E731
+    show('Screen.draw with a color name', best(resolving(name), 10000), best(name, 10000))
+    show('Screen.draw with a list of names', best(resolving(names), 10000), best(names, 10000))
+
+    helicopter = Helicopter(50, 20, color='red')
+    cube = Cube(50, 20, color=screen.COLOR_RAINBOW)
+    for obj in (helicopter, cube):
+        render = lambda: obj.render(screen)  # noqa: E731
+        show('{} render'.format(type(obj).__name__), best(resolving(render)), best(render))
+
+
+@main.command()
+def collisions():
+    """ Projectile hits found with a spatial hash vs checking every projectile against every enemy """
+    rng = Random(0)
+    width, height = 200, 50
+    enemies = [Square(rng.randrange(width), rng.randrange(height), size=3, solid=True) for _ in range(40)]
+    for enemy in enemies:
+        enemy.coords = set(translate(enemy.template(enemy.size, enemy.solid), enemy.x - 1, enemy.y - 1))
+
+    def brute_force(projectiles):
+        return [[projectile for projectile in projectiles if projectile.coords & enemy.coords] for enemy in enemies]
+
+    def spatial_hash(projectiles):
+        projectile_hash = SpatialHash()
+        for index, projectile in enumerate(projectiles):
+            projectile_hash.add(index, projectile.coords)
+        return [[projectiles[index] for index in sorted(projectile_hash.query(enemy.coords))
+                 if projectiles[index].coords & enemy.coords] for enemy in enemies]
+
+    for count in (100, 1000, 10000):
+        projectiles = [Projectile(rng.randrange(width), rng.randrange(height)) for _ in range(count)]
+        for projectile in projectiles:
+            projectile.coords = {(projectile.x, projectile.y)}
+        assert brute_force(projectiles) == spatial_hash(projectiles)
+        number = 10000 // count
+        show('40 enemies, {} projectiles'.format(count),
+             best(lambda: brute_force(projectiles), number), best(lambda: spatial_hash(projectiles), number))
+
+
+@main.command()
+@click.option('--count', default=10000, help='Number of live objects of each class')
+def memory(count):
+    """
+    Memory per object and create time of the core classes vs subclasses without `__slots__` that create their kids
+    and coords up front, like the classes did before
+    """
+    classes = [
+        (ScreenObject, lambda cls: cls(1, 1)),
+        (Projectile, lambda cls: cls(1, 1)),
+        (Char, lambda cls: cls(1, 1, char='x')),
+        (Explosion, lambda cls: cls(1, 1)),
+        (Text, lambda cls: cls(1, 1, 'text')),
+        (Bitmap, lambda cls: cls(1, 1)),
+    ]
+
+    def size(create):
+        gc.collect()
+        tracemalloc.start()
+        objects = [create() for _ in range(count)]  # noqa: F841
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size // count
+
+    def eager(create):
+        def create_eager():
+            obj = create()
+            obj.kids, obj.coords
+            return obj
+        return create_eager
+
+    for cls, create in classes:
+        unslotted = type(cls.__name__, (cls,), {})
+        before, after = eager(lambda: create(unslotted)), lambda: create(cls)
+        show('{} ({} -> {} bytes)'.format(cls.__name__, size(before), size(after)), best(before), best(after))
+
+
+if __name__ == '__main__':
+    main()
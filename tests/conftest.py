@@ -1,23 +1,15 @@
 from types import MethodType
-from unittest.mock import Mock
 
 import pytest
 
 from games.controller import Controller
-from games.screen import Screen, ScreenBuffer, Scene
+from games.screen import HeadlessScreen, Scene
 from games.objects import Border, AbstractPlayer, Diamond
 
 
 @pytest.fixture
-def screen(monkeypatch):
-    monkeypatch.setattr('curses.cbreak', Mock())
-    monkeypatch.setattr('curses.nocbreak', Mock())
-    monkeypatch.setattr('curses.endwin', Mock())
-
-    screen = Screen(border=Border())
-    screen._width = 80
-    screen._height = 20
-    screen.buffer = ScreenBuffer(80, 20)
+def screen():
+    screen = HeadlessScreen(border=Border(), width=80, height=20)
 
     def without_distractions(self):
         content = []
@@ -0,0 +1,15 @@
+from games.cache import LRUCache
+
+
+def test_lru_cache():
+    cache = LRUCache(max_size=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+
+    assert cache.get('a') == 1  # 'b' is now least recently used
+    cache.put('c', 3)
+
+    assert 'b' not in cache
+    assert cache.get('b', 0) == 0
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert (len(cache), cache.hits, cache.misses) == (2, 3, 1)
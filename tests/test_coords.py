@@ -0,0 +1,34 @@
+from games.coords import OccupancyGrid, SpatialHash, translate
+
+
+def test_spatial_hash():
+    spatial_hash = SpatialHash(cell_size=4)
+    spatial_hash.add('a', {(1, 1), (2, 3)})
+    spatial_hash.add('b', {(5, 1)})
+    spatial_hash.add('c', {(-1, 9.5)})
+
+    assert len(spatial_hash) == 3
+    assert spatial_hash.query({(3, 3)}) == {'a'}
+    assert spatial_hash.query({(3, 3), (7, 0)}) == {'a', 'b'}
+    assert spatial_hash.query({(-4, 8)}) == {'c'}
+    assert spatial_hash.query({(20, 20)}) == set()
+
+
+def test_occupancy_grid():
+    grid = OccupancyGrid.from_coords({(-2, 1), (3, 1), (0, 4)})
+    assert grid.overlaps(OccupancyGrid.from_coords({(-2, 1)}))
+    assert grid.overlaps(OccupancyGrid.from_coords({(5, 5), (0, 4)}))
+    assert not grid.overlaps(OccupancyGrid.from_coords({(-3, 1), (-1, 1), (4, 1), (0, 3)}))
+    assert grid.overlaps(OccupancyGrid.from_coords({(-3, 1)}), x_delta=1)
+    assert grid.overlaps(OccupancyGrid.from_coords({(8, 0)}), x_delta=-5, y_delta=1)
+
+    moved = OccupancyGrid(grid.rows, x=grid.x + 2, y=grid.y - 1)
+    assert moved.overlaps(OccupancyGrid.from_coords({(0, 0), (9, 9)}))
+    assert not moved.overlaps(OccupancyGrid.from_coords({(-2, 1)}))
+
+    assert not OccupancyGrid.from_coords([]).overlaps(grid)
+
+
+def test_translate():
+    assert translate(((0, 0), (1, -1)), 2, 3) == {(2, 3), (3, 2)}
+    assert translate((), 2, 3) == set()
@@ -1,6 +1,10 @@
+import random
+
+from games.last_survivor import LastSurvivor
 from games.manager import Manager
 from games.controller import Controller
-from games.screen import Scene
+from games.objects import Border
+from games.screen import HeadlessScreen, Scene
 
 
 def test_manager():
@@ -21,3 +25,22 @@ def test_game(screen):
         game.play()
         assert game.current_scene
         game.reset_scene()
+
+
+def test_headless_play():
+    state = random.getstate()
+    random.seed(0)  # So zombies don't randomly get the player before the end
+    try:
+        screen = HeadlessScreen(border=Border(), width=120, height=40)
+        screen.press('x', after=5)    # Skip intro
+        screen.press('q', after=300)  # And then exit
+
+        with screen:
+            game = LastSurvivor(screen)
+            screen.controller = game
+            screen.play(game)
+    finally:
+        random.setstate(state)
+
+    assert screen.frames >= 300
+    assert screen.status['Killed']
@@ -1,6 +1,8 @@
+from math import pi
 from unittest.mock import Mock
 from games.objects import (AbstractPlayer, Stickman, ScreenObject, Circle, Char,
-                           ScreenObjectGroup, CompassionateBoss, AbstractEnemies, Bitmap, Text)
+                           ScreenObjectGroup, CompassionateBoss, AbstractEnemies, Bitmap, Text, Border, Projectile,
+                           ObjectMap, Tree, Landscape, ParticleSystem, Object3D, Cube, Square, Bar, Diamond, Triangle)
 
 
 def test_player(screen):
@@ -53,6 +55,73 @@ def test_all_kids(screen):
     assert so.all_coords == {(10, 11), (9, 9), (12, 10), (8, 10), (11, 9), (10, 10), (10, 9), (9, 11), (11, 11)}
 
 
+def test_slots():
+    projectile = Projectile(1, 2)
+    assert not hasattr(projectile, '__dict__')
+    assert projectile._kids is None and projectile._coords is None
+
+    assert projectile.kids == set() and projectile.coords == set()  # Created when used
+
+    class Shot(Projectile):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.damage = 2
+
+    assert Shot(1, 2).damage == 2
+
+
+def test_all_kids_cached():
+    so = ScreenObject(1, 1)
+    circle = Circle(10, 10)
+    char = Char(10, 10, char='X')
+    circle.add_kid(char)
+    so.add_kid(circle)
+
+    all_kids = so.all_kids
+    all_coords = so.all_coords
+    assert so.all_kids is all_kids
+    assert so.all_coords is all_coords
+
+    char.coords = {(1, 2)}
+    assert so.all_kids is all_kids
+    assert so.all_coords == {(1, 2)}
+
+    bullet = Char(5, 5, char='.')
+    circle.kids.add(bullet)
+    assert so.all_kids == {circle, char, bullet}
+
+    circle.remove_kid(char)
+    assert so.all_kids == {circle, bullet}
+    assert so.all_coords == set()
+
+    circle.kids = {char}
+    assert so.all_kids == {circle, char}
+    assert so.all_coords == {(1, 2)}
+    assert bullet._holders == set()
+
+
+def test_shape_templates(screen):
+    square = Square(5, 5, size=3)
+    square.render(screen)
+    assert square.coords == {(3, 3), (3, 4), (3, 5), (4, 3), (4, 5), (5, 3), (5, 4), (5, 5)}
+    assert Square(5, 5, size=3).template(3, False) is square.template(3, False)
+
+    square.solid = True
+    square.render(screen)
+    assert len(square.coords) == 9
+
+    # Cells are truncated like int(x + dx), also for fractional positions around 0
+    for x, y in ((5.5, 3.25), (0.5, 0.5), (-0.5, -1.25), (-3.5, 1.5), (2, -0.75), (-6, -4)):
+        for shape, key in ((Circle(x, y), ()), (Diamond(x, y), ()), (Triangle(x, y, size=3), (3,))):
+            shape.render(screen)
+            assert shape.coords == {(int(x + dx), int(y + dy)) for dx, dy in shape.template(*key)}, (shape, x, y)
+
+    bar = Bar(5.5, 2.7, size=3)
+    bar.render(screen)
+    assert bar.coords == {(3, 2), (4, 2), (5, 2)}
+    assert bar.shifted_coords(x_delta=-1) == {(2, 2), (3, 2), (4, 2)}
+
+
 def test_is_out(screen):
     so = Bitmap(0, 0, x_delta=-1)
     assert not so.is_out
@@ -190,6 +259,101 @@ def test_enemies(screen, player):
     assert len(screen) == 1  # Just "enemies" object
 
 
+def test_enemies_hit(screen, player):
+    class Enemies(AbstractEnemies):
+        def create_enemy(self):
+            return Circle(10, 5, size=2)
+
+    enemies = Enemies(player, max_enemies=1)
+    screen.add(enemies, player)
+    screen.render()
+    enemy = list(enemies.kids)[0]
+    enemy.render(screen)
+
+    missed = Projectile(30, 5, y_delta=0)
+    hit = Projectile(12, 5, y_delta=0)
+    for projectile in (missed, hit):
+        projectile.render(screen)
+        player.add_kid(projectile)
+
+    enemies.render(screen)
+
+    assert enemy not in enemies.kids
+    assert player.kids == {missed}
+    assert player.score == 1
+
+
+def test_particle_system(screen):
+    particles = ParticleSystem(0, 0, shape='@')
+    particles.emit(10, 5, x_delta=1, fuse=3, size=4, bursts=2)
+    particles.emit(10, 8, x_delta=-1)
+    screen.add(particles)
+
+    for _ in range(3):
+        particles.render(screen)
+    assert particles.coords == {(13, 5), (7, 8)}
+
+    particles.render(screen)  # Stopped and the first ring (size 2) is drawn in full
+    assert particles.coords == {(13, 5), (6, 8), (12, 4), (13, 4), (12, 5)}
+
+    particles.hit({(6, 8), (12, 4)})  # Particle without a fuse is removed and so is the first ring
+    assert particles.coords == {(13, 5)}
+
+    particles.render(screen)
+    assert len(particles.xs) == 1
+    assert particles.coords == {(12, 4), (13, 4), (12, 5), (13, 5)}  # Only the second ring (size 2) is left
+
+    for _ in range(2):
+        particles.render(screen)
+    assert particles in screen
+
+    particles.render(screen)
+    assert not particles.coords
+    assert particles not in screen
+
+
+def test_object3d_rotation(monkeypatch):
+    obj = Object3D(10, 10, points=[(2, 0, 0), (0, 2, 0, 'red')], rotate_axes=(0, 0, 1))
+
+    x, y, z = obj.rotate_point((2, 0, 0), pi / 2)
+    assert (round(x, 6), round(y, 6), z) == (0, 2, 0)
+    assert obj.project(pi / 2) == [(0, 2), (-2, 0)]
+    assert Object3D.rotation((0, 0, 1), pi / 2) is Object3D.rotation((0, 0, 1), pi / 2)  # Cached
+
+    points = [(x, y, z) for x in range(-3, 4) for y in range(-3, 4) for z in (-1, 1)]
+    obj = Object3D(10, 10, points=points, size=3, magnify_by_size=True)
+    projected = obj.project(1)
+    monkeypatch.setattr(Object3D, 'NUMPY_MIN_POINTS', len(points) + 1)
+    obj._xyz_points = None
+    assert obj.project(1) == projected
+
+
+def test_object3d_edges():
+    assert Object3D.line(0, 0, 4, 2) == [(0, 0), (1, 1), (2, 1), (3, 2), (4, 2)]
+    assert Object3D.line(4, 2, 0, 0) == Object3D.line(0, 0, 4, 2)
+    assert Object3D.line(1, 3, 1, 0) == [(1, 0), (1, 1), (1, 2), (1, 3)]
+
+    edges = Object3D.edges([(5, 5), (8, 5), (8, 7)])
+    assert sorted(edges) == [(1, 0), (2, 0), (3, 1)]  # Relative to the first point without the points
+    assert Object3D.edges([(0, 1), (3, 1), (3, 3)]) is edges
+
+
+def test_object3d_frames(screen):
+    Object3D.frames.clear()
+    cube = Cube(20, 10, size=3)
+    other_cube = Cube(50.5, 12, size=3)
+    screen.renders = 7
+    cube.render(screen)
+    other_cube.render(screen)
+
+    assert (Object3D.frames.hits, Object3D.frames.misses) == (1, 1)
+    assert other_cube.coords == {(x + 30, y + 2) for x, y in cube.coords}
+
+    screen.renders = 384  # Same phase a few turns later
+    cube.render(screen)
+    assert Object3D.frames.misses == 1
+
+
 def test_bitmap(screen):
     class ABC(Bitmap):
         bitmap = r"""
@@ -219,3 +383,113 @@ def"""  # noqa
         assert abc.coords == {
             (10, 9), (11, 9),
             (9, 10), (10, 10), (11, 10)}
+
+
+def test_bitmap_sprite():
+    class Arrow(Bitmap):
+        bitmap = r"""
+ >
+->"""  # noqa
+        flip_map = {'>': '<'}
+
+    arrow = Arrow(10, 10)
+    flipped = Arrow(10, 10, flip=True)
+
+    assert arrow.sprite(arrow.bitmap) == (2, 2, ((1, 0, '>'), (0, 1, '-'), (1, 1, '>')))
+    assert flipped.sprite(flipped.bitmap) == (2, 2, ((0, 0, '<'), (0, 1, '<'), (1, 1, '-')))
+    assert Arrow(1, 1).sprite(arrow.bitmap) is arrow.sprite(arrow.bitmap)
+
+
+def test_object_map_tiles(screen):
+    class Forest(ObjectMap):
+        bitmap = 'TT T'
+        object_map = {'T': Tree}
+
+    forest = Forest(0, 5, grid_size=10)
+    forest.render(screen)
+    tiles_created = ObjectMap.tiles_created
+    coords = forest.coords
+
+    for _ in range(3):
+        forest.render(screen)
+
+    assert ObjectMap.tiles_created == tiles_created
+    assert forest._objects_mapped == 12
+    assert forest.coords == coords
+    assert {x for x, _ in coords} > {5, 15, 35}
+
+
+def test_landscape_prerender(screen):
+    class Hills(Landscape):
+        bitmap = 'T  R TV'
+
+    class DrawnHills(Hills):
+        prerender = False
+
+    def render(landscape):
+        screen.buffer.clear()
+        for _ in range(12):
+            landscape.render(screen)
+        landscape.x -= 1
+        screen.buffer.clear()
+        landscape.render(screen)
+        return [row[:] for row in screen.buffer.buffer], landscape.coords
+
+    misses = ObjectMap._rasters.misses
+    rows, coords = render(Hills(13, 5))
+    drawn_rows, drawn_coords = render(DrawnHills(13, 5))
+
+    assert Hills(0, 0).animation_period == 30
+    assert len(coords) > 20
+    assert rows == drawn_rows
+    assert coords == drawn_coords
+    assert ObjectMap._rasters.misses - misses == 12  # Same phase after moving left
+
+    hills = Hills(13, 5)
+    hills.render(screen)
+    probe = ScreenObject(0, 0)
+    probe.coords = {(0, 0)}
+    cells = {(x, y) for x in range(screen.width) for y in range(screen.height)}
+    assert {(x, y) for x, y in cells if hills.overlaps(probe, x_delta=x, y_delta=y)} == hills.coords
+
+    probe.coords = {(x - 1, y) for x, y in hills.coords}
+    assert hills.overlaps(probe, x_delta=1)
+    assert not hills.overlaps(probe, y_delta=-10)
+
+    # Offsets cut to size are new tuples each render, but equal ones find the same raster
+    class Ridge(Landscape):
+        bitmap = 'T R\nR T'
+
+    ridge = Ridge(13, 5)
+    ridge.size = 1
+    misses = ObjectMap._rasters.misses
+    for _ in range(ridge.animation_period * 2):
+        ridge.render(screen)
+    assert ObjectMap._rasters.misses - misses == ridge.animation_period
+    assert len(ObjectMap._rasters) <= ObjectMap._rasters.max_size
+
+
+def test_border(screen):
+    border = Border(title='Hi')
+    border.set_levels(0.5, 1)
+    border.render(screen)
+    cells = border._cells
+
+    rows = screen.buffer.buffer
+    assert ''.join(char for char, _ in rows[0][:3]) == '╔══'
+    assert ''.join(char for char, _ in rows[0][38:42]) == ' Hi '
+    assert rows[19][79] == ('╝', None)
+    assert [rows[y][1] for y in (8, 9, 18)] == [(None, None), ('│', screen.COLOR_RED), ('│', screen.COLOR_RED)]
+    assert [rows[y][78] for y in (0, 1, 18)] == [('═', None), ('│', screen.COLOR_GREEN), ('│', screen.COLOR_GREEN)]
+
+    border.render(screen)
+    assert border._cells is cells
+
+    border.status['score'] = 1
+    border.render(screen)
+    assert border._cells is cells
+    assert ''.join(char for char, _ in rows[19][35:45]) == ' Score: 1 '
+
+    border.set_levels(0.2, 1)
+    border.render(screen)
+    assert border._cells is not cells
@@ -0,0 +1,41 @@
+from games.objects import Projectile, ScreenObject
+from games.pool import ObjectPool, pool
+from games.screen import HeadlessScreen
+
+
+def test_object_pool():
+    object_pool = ObjectPool()
+    projectile = object_pool.acquire(Projectile, 1, 2, color='red')
+    assert object_pool.created == 1
+
+    object_pool.release(projectile)
+    object_pool.release(Projectile(1, 2))  # Not from the pool, so ignored
+    assert len(object_pool) == 1
+
+    reused = object_pool.acquire(Projectile, 3, 4)
+    assert reused is projectile
+    assert (reused.x, reused.y, reused.color) == (3, 4, None)
+    assert (object_pool.created, object_pool.reused, len(object_pool)) == (1, 1, 0)
+
+    stats = object_pool.stats()
+    assert stats['created'] == 1 and stats['reused'] == 1
+    assert stats['collections'] >= 0
+
+
+def test_screen_releases_removed_objects():
+    pool.clear()
+    screen = HeadlessScreen(width=20, height=10)
+    parent = ScreenObject(5, 5)
+    kept = Projectile.acquire(5, 5, y_delta=0, parent=parent)
+    removed = Projectile.acquire(5, 5, y_delta=0, parent=parent)
+    parent.add_kid(kept)
+    parent.add_kid(removed)
+    screen.add(kept, removed)
+    screen.render()
+
+    removed.remove()
+    screen.remove(kept)  # Still a kid of the parent
+    screen.render()
+
+    assert pool.acquire(Projectile, 1, 1) is removed
+    assert len(pool) == 0
@@ -1,4 +1,10 @@
-from games.screen import Screen
+import curses
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from games.screen import Screen, ScreenBuffer, CompactScreenBuffer, AnsiScreen, HeadlessScreen
 from games.objects import Circle, Square, Diamond
 
 
@@ -24,6 +30,20 @@ def test_add_and_remove():
     assert len(so) == 0
 
 
+def test_remove_later(screen):
+    circle = Circle(1, 1)
+    square = Square(-10, -10)
+    screen.add(circle, square)
+    screen.add(circle)
+    assert list(screen) == [circle, square]
+
+    screen.remove_later(circle)
+    assert circle in screen
+
+    screen.render()
+    assert list(screen) == []
+
+
 def test_enter_exit(screen):
     # These don't seem to work under pytest
     with screen as s:
@@ -55,3 +75,226 @@ def test_buffer_render(screen):
             [('O', 256), ('O', 256), ('O', 256)],
             [('O', 256), ('O', 256)],
             [('O', 256), ('O', 256), ('O', 256)]]
+
+
+def test_buffer_skips_unchanged_rows():
+    buffer = ScreenBuffer(10, 5)
+    curses_screen = Mock()
+
+    buffer.add(1, 2, 'X')
+    assert buffer.dirty_rows == [False, False, True, False, False]
+    buffer.render(curses_screen, None)
+    assert curses_screen.addstr.call_count == 1
+
+    curses_screen.reset_mock()
+    buffer.clear()
+    buffer.add(1, 2, 'X')
+    buffer.render(curses_screen, None)
+    assert not curses_screen.addstr.called
+
+    buffer.clear()
+    buffer.render(curses_screen, None)
+    assert curses_screen.addstr.call_count == 2  # '.' and then ' ' to erase
+    assert buffer.screen[2][1] == (None, None)
+
+
+def test_buffer_renders_runs():
+    buffer = ScreenBuffer(10, 5)
+    curses_screen = Mock()
+
+    for x, char in enumerate('abc'):
+        buffer.add(x + 2, 1, char, 256)
+    buffer.add(5, 1, 'd')
+    buffer.add(7, 1, 'e')
+    buffer.render(curses_screen, None)
+
+    assert [c[0] for c in curses_screen.addstr.call_args_list] == [(1, 2, 'abc', 256), (1, 5, 'd'), (1, 7, 'e')]
+    assert buffer.calls_saved == 2
+
+    curses_screen.reset_mock()
+    buffer.clear()
+    buffer.add(5, 1, 'd')
+    buffer.render(curses_screen, None)
+
+    assert [c[0] for c in curses_screen.addstr.call_args_list] == [
+        (1, 2, '...'), (1, 7, '.'), (1, 2, '   '), (1, 7, ' ')]
+    assert buffer.calls_saved == 4
+
+
+def test_buffer_swaps_without_reallocating():
+    buffer = ScreenBuffer(10, 5)
+    rows = {id(row) for row in buffer.buffer + buffer.screen}
+
+    for frame in range(3):
+        buffer.clear()
+        buffer.add(frame, 1, 'X')
+        buffer.render(Mock(), None)
+        assert buffer.screen[1][frame] == ('X', None)
+        assert buffer.screen[1].count(('X', None)) == 1
+
+    assert {id(row) for row in buffer.buffer + buffer.screen} == rows
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_compact_buffer(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr('games.screen.numpy', None)
+    buffer = CompactScreenBuffer(10, 5)
+    curses_screen = Mock()
+
+    buffer.add(2, 1, 'a', 256)
+    buffer.add(3, 1, 'b', 256)
+    buffer.add(9, 4, 'c')
+    buffer.render(curses_screen, None)
+
+    assert [c[0] for c in curses_screen.addstr.call_args_list] == [(1, 2, 'ab', 256), (4, 9, 'c')]
+    assert buffer.screen[1][2:4] == [('a', 256), ('b', 256)]
+    assert buffer.screen[4][9] == ('c', None)
+
+    curses_screen.reset_mock()
+    buffer.clear()
+    buffer.add(3, 1, 'b', 256)
+    buffer.render(curses_screen, None)
+
+    assert [c[0] for c in curses_screen.addstr.call_args_list] == [(1, 2, '.'), (4, 9, '.'), (1, 2, ' '), (4, 9, ' ')]
+    assert buffer.screen[1][2:4] == [(None, None), ('b', 256)]
+
+
+def test_compact_buffer_clears_in_place():
+    buffer = CompactScreenBuffer(10, 5)
+    arrays = {id(a) for a in (buffer.dirty_rows, buffer._screen_dirty_rows, buffer.chars, buffer.screen_chars)}
+
+    for frame in range(3):
+        buffer.clear()
+        buffer.add(frame, 1, 'X')
+        buffer.render(Mock(), None)
+        assert buffer.screen[1][frame] == ('X', None)
+        assert [cell for row in buffer.screen for cell in row].count(('X', None)) == 1
+
+    assert {id(a) for a in (buffer.dirty_rows, buffer._screen_dirty_rows, buffer.chars, buffer.screen_chars)} == arrays
+
+
+def test_ansi_encode():
+    screen = AnsiScreen()
+    frame = screen.encode([(1, 2, 'ab', 31), (1, 6, 'c', 31), (3, 0, '  ', ScreenBuffer.BLANK)])
+
+    assert frame == '\x1b[?2026h\x1b[2;3H\x1b[31mab\x1b[2Cc\x1b[4;1H\x1b[39m  \x1b[?2026l'
+    assert screen.encode([(0, 0, 'd', None)]) == '\x1b[?2026h\x1b[1;1Hd\x1b[?2026l'
+
+
+def test_ansi_render_buffer_skips_unchanged_frames():
+    screen = AnsiScreen()
+    screen._width, screen._height = 10, 3
+    screen.buffer = ScreenBuffer(10, 3)
+    read_fd, screen._output = os.pipe()
+    try:
+        screen.draw(1, 1, 'X')
+        screen.render_buffer()
+        frame = b'\x1b[?2026h\x1b[2;2HX\x1b[?2026l'
+        assert os.read(read_fd, 1024) == frame
+        assert screen.bytes_written == len(frame)
+
+        screen.buffer.clear()
+        screen.draw(1, 1, 'X')
+        screen.render_buffer()
+        assert screen.bytes_written == 0
+    finally:
+        os.close(read_fd)
+        os.close(screen._output)
+
+
+def test_ansi_terminal_size(monkeypatch):
+    screen = AnsiScreen()
+    screen._output = 1
+    monkeypatch.setenv('COLUMNS', '10')
+    monkeypatch.setattr('os.get_terminal_size', lambda fd: os.terminal_size((100, 30)))
+    assert screen.terminal_size() == (30, 100)
+
+    def not_a_terminal(fd):
+        raise OSError('Not a terminal')
+
+    monkeypatch.setattr('os.get_terminal_size', not_a_terminal)
+    assert screen.terminal_size() == (25, 80)
+
+    screen._width, screen._height = 120, 39
+    assert screen.terminal_size() == (40, 120)
+
+
+def test_ansi_keys():
+    screen = AnsiScreen()
+    screen._read_keys('\x1b[Dq\x1b\r')
+
+    assert list(screen._keys) == [curses.KEY_LEFT, ord('q'), 27, 10]
+
+
+def test_resolve_color(screen):
+    assert screen.resolve_color('red') == screen.COLOR_RED == 256
+    assert screen.resolve_color('white') is None
+    assert screen.resolve_color(screen.COLOR_RAINBOW) == tuple(screen.rainbow_colors)
+    assert screen.resolve_color('rainbow') == tuple(screen.rainbow_colors)
+    assert screen.resolve_color(('white', 'yellow')) == (None, screen.COLOR_YELLOW)
+    assert screen._color_lut['red'] == 256
+
+    screen.draw(1, 1, 'X', ['green'])
+    assert screen.buffer.buffer[1][1] == ('X', screen.COLOR_GREEN)
+    assert screen._color_lut[('green',)] == (screen.COLOR_GREEN,)
+
+    with pytest.raises(ValueError):
+        screen.draw(1, 1, 'X', 'pink')
+
+
+@pytest.mark.parametrize('fps,secs_per_tick,frames', [(10, 0, 30), (30, 0, 90), (30, 0.05, 24)])
+def test_play_fixed_ticks(monkeypatch, fps, secs_per_tick, frames):
+    clock = [0]
+    monkeypatch.setattr('games.screen.monotonic', lambda: clock[0])
+    monkeypatch.setattr('games.screen.sleep', lambda secs: clock.__setitem__(0, clock[0] + secs))
+
+    screen = HeadlessScreen(fps=fps)
+    screen.render_buffer = Mock()
+    controller = Mock(done=False)
+
+    def play():
+        clock[0] += secs_per_tick
+        controller.done = screen.renders >= 90
+    controller.play.side_effect = play
+
+    Screen.play(screen, controller)
+
+    assert screen.renders == 90
+    assert screen.render_buffer.call_count == frames
+
+
+def test_resize(screen):
+    near_edge = Circle(70, 17)
+    middle = Square(40, 10)
+    screen.controller = Mock()
+    screen.add(near_edge, middle)
+    screen.render()
+    rows = {id(row) for row in screen.buffer.buffer + screen.buffer.screen}
+
+    screen.resize(80, 30)
+    screen.render()
+
+    assert (screen.width, screen.height) == (80, 30)
+    assert rows < {id(row) for row in screen.buffer.buffer + screen.buffer.screen}
+    assert (near_edge.x, near_edge.y) == (70, 27)
+    assert (middle.x, middle.y) == (40, 15)
+    assert not screen.controller.reset_scene.called
+
+    screen.resize(100, 30)
+    screen.render()
+
+    assert len(screen.buffer.screen[0]) == 100
+    assert (near_edge.x, near_edge.y) == (90, 27)
+
+
+def test_compact_buffer_resize():
+    buffer = CompactScreenBuffer(10, 5)
+    chars = buffer.chars
+    buffer.add(2, 1, 'a')
+    buffer.diff()
+
+    buffer.resize(10, 8)
+
+    assert buffer.chars is chars or buffer.screen_chars is chars
+    assert buffer.screen == [[(None, None)] * 10] * 8